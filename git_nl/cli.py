@@ -1,35 +1,74 @@
 """CLI entrypoint wiring the rule-based intent pipeline end-to-end."""
 
+from __future__ import annotations
+
 import argparse
 import json
+import sys
 import time
-from typing import Any
+from dataclasses import asdict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional
 
 from git_nl import config
-from git_nl.executor import Executor
-from git_nl.definitions.router import IntentRouter
-from git_nl.planner import Planner
-from git_nl.verifier import Verifier
+
+try:  # Optional fast JSON encoder for --debug output; stdlib json is the fallback.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+if TYPE_CHECKING:  # pragma: no cover - pipeline modules are imported lazily in run()
+    from git_nl.definitions.router import IntentRouter
+    from git_nl.definitions.types import IntentResult
+    from git_nl.executor import Executor
+    from git_nl.planner import Planner
+    from git_nl.verifier import Verifier
+
+_ROUTER: Optional[IntentRouter] = None
+_PLANNER: Optional[Planner] = None
+
+
+def _get_router() -> IntentRouter:
+    global _ROUTER
+    if _ROUTER is None:
+        from git_nl.definitions.router import IntentRouter
+
+        _ROUTER = IntentRouter()
+    return _ROUTER
+
+
+@lru_cache(maxsize=128)
+def _cached_route_many(text: str) -> tuple[IntentResult, ...]:
+    """Memoize routing (hits and misses) per input; call `cache_clear()` after config changes."""
+    return tuple(_get_router().route_many(text))
+
+
+def _dumps(payload: Any) -> str:
+    if orjson is not None:
+        encoded = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+        # orjson always writes raw UTF-8; output stays \u-escaped ASCII, so only the rare
+        # non-ASCII payload takes the stdlib path below.
+        if encoded.isascii():
+            return encoded.decode("ascii")
+    return json.dumps(payload, indent=2)
 
 
 def _print_result(title: str, payload: Any) -> None:
-    print(f"\n{title}:")
-    print(json.dumps(payload, indent=2))
+    # One write per section: each print() is two writes, each flushed on a line-buffered tty.
+    sys.stdout.write(f"\n{title}:\n{_dumps(payload)}\n")
 
 
 def _format_command_results(results: list[Any]) -> list[dict[str, Any]]:
-    formatted = []
-    for r in results:
-        formatted.append(
-            {
-                "command": r.command,
-                "returncode": r.returncode,
-                "stdout": r.stdout,
-                "stderr": r.stderr,
-                "latency_ms": float(f"{r.latency_sec * 1000:.3f}"),
-            }
-        )
-    return formatted
+    return [
+        {
+            "command": r.command,
+            "returncode": r.returncode,
+            "stdout": r.stdout,
+            "stderr": r.stderr,
+            "latency_ms": round(r.latency_sec * 1000, 3),
+        }
+        for r in results
+    ]
 
 
 def _print_latency_summary(title: str, results: list[Any]) -> None:
@@ -105,23 +144,45 @@ def _print_summary(
             return f"Action failed during verification ({last.command}): {err}"
         return "Action failed."
 
-    print()
+    lines = [""]
     if outcome.startswith("failed") or outcome.startswith("no intent"):
-        print(_failure_line())
+        lines.append(_failure_line())
     else:
-        print(_success_line())
+        lines.append(_success_line())
         if message:
-            print(f'  - Commit message: "{message}"')
+            lines.append(f'  - Commit message: "{message}"')
         if branch and intent_result.intent in {"create_branch", "switch_branch", "push_branch"}:
-            print(f'  - Branch: "{branch}"')
+            lines.append(f'  - Branch: "{branch}"')
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _get_planner() -> Planner:
+    # Shared like the router, so rendered plans stay memoized across run() calls.
+    global _PLANNER
+    if _PLANNER is None:
+        from git_nl.planner import Planner
+
+        _PLANNER = Planner()
+    return _PLANNER
+
+
+def _build_pipeline(execute: bool) -> tuple[Planner, Executor, Verifier]:
+    # Deferred so `--help`, argument errors and unrecognized requests never pay for these imports.
+    from git_nl.executor import Executor
+    from git_nl.verifier import Verifier
+
+    executor = Executor(dry_run=not execute)
+    return _get_planner(), executor, Verifier(executor)
 
 
 def run(text: str, execute: bool, explain: bool, debug: bool) -> None:
-    router = IntentRouter()
     detect_started = time.perf_counter()
-    intent_results = router.route_many(text)
+    # Key on stripped text only: case and inner spacing are significant for messages/branch names.
+    intent_results = list(_cached_route_many(text.strip()))
     detect_ms = (time.perf_counter() - detect_started) * 1000
     total_intents = len(intent_results)
+    # Stateless across intents, so build the pipeline stages at most once per run.
+    pipeline: Optional[tuple[Planner, Executor, Verifier]] = None
     for idx, intent_result in enumerate(intent_results):
         detect_ms_for_intent = detect_ms if idx == 0 else 0.0
         if total_intents > 1:
@@ -136,10 +197,12 @@ def run(text: str, execute: bool, explain: bool, debug: bool) -> None:
         if explain or debug:
             print(f"\nRoute used: {route_used}")
         if debug:
-            _print_result("Intent", intent_result.__dict__)
+            _print_result("Intent", asdict(intent_result))
 
         if intent_result.intent != "unknown":
-            planner = Planner()
+            if pipeline is None:
+                pipeline = _build_pipeline(execute)
+            planner, executor, verifier = pipeline
             plan = planner.build_plan(intent_result)
 
             if debug:
@@ -152,9 +215,6 @@ def run(text: str, execute: bool, explain: bool, debug: bool) -> None:
                     },
                 )
 
-            executor = Executor(dry_run=not execute)
-            verifier = Verifier(executor)
-
             exec_results = executor.run_plan(plan)
             exec_ms = _sum_latency_ms(exec_results)
 
@@ -18,6 +18,16 @@ SEMANTIC_CONFIDENCE_BY_INTENT = {
 ENABLE_LLM_FALLBACK = True
 LLM_CONFIDENCE_THRESHOLD = 0.60
 LLM_TIMEOUT = 6.0
+# Ceiling for the adaptive timeout (twice the recent p95 latency) on a slow provider.
+LLM_MAX_TIMEOUT = 20.0
+# Connection failures are retried with exponential backoff (0.1s, 0.2s, ...); timeouts are not retried.
+LLM_MAX_ATTEMPTS = 3
+LLM_RETRY_BACKOFF = 0.1
+LLM_CACHE_SIZE = 256
+# Reuse an LLM classification for near-duplicate phrasings (cosine over term vectors).
+LLM_SEMANTIC_CACHE_THRESHOLD = 0.90
+LLM_SEMANTIC_CACHE_TTL = 300.0
+LLM_SEMANTIC_CACHE_SIZE = 128
 
 DRY_RUN_DEFAULT = True
 
@@ -1,7 +1,29 @@
 """Intent detection package."""
 
-from .llm import LLMIntentDetector  # noqa: F401
-from .router import IntentRouter  # noqa: F401
-from .rule_definitions import RuleBasedIntentDetector  # noqa: F401
-from .types import IntentResult  # noqa: F401
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:  # pragma: no cover - static re-exports only
+    from .llm import LLMIntentDetector  # noqa: F401
+    from .router import IntentRouter  # noqa: F401
+    from .rule_definitions import RuleBasedIntentDetector  # noqa: F401
+    from .types import IntentResult  # noqa: F401
+
+# Exports resolve lazily (PEP 562) so importing e.g. `.types` does not drag in the LLM/urllib stack.
+_LAZY_EXPORTS = {
+    "LLMIntentDetector": ".llm",
+    "IntentRouter": ".router",
+    "RuleBasedIntentDetector": ".rule_definitions",
+    "IntentResult": ".types",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
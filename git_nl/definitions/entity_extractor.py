@@ -4,48 +4,117 @@ from __future__ import annotations
 
 import re
 import shlex
-from typing import Dict, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
 
 # Allowed characters for git ref/branch-style tokens.
 _REF_CHARS = r"[A-Za-z0-9._\-/~^]+"
 _REF_PATTERN = re.compile(rf"^{_REF_CHARS}$")
 
-# Reusable phrase-based patterns (kept small and readable).
+# Capture classes shared by the phrase patterns below; targets also accept ~ and ^.
+_BRANCH_VALUE = r"[_A-Za-z0-9.\-/]+"
+_TARGET_VALUE = r"[_A-Za-z0-9.\-/~^]+"
+
+# Reusable phrase-based patterns (kept small and readable). All tables are compiled
+# once at import and kept as tuples so the hot path only ever runs prebuilt matchers.
 _MESSAGE_PATTERN = re.compile(
     r"\b(?:with\s+(?:the\s+)?message|message|msg)\s+(?P<message>['\"`]?[^'\"`]+['\"`]?)",
     re.IGNORECASE,
 )
 
-_BRANCH_PATTERNS = [
+_BRANCH_PATTERNS = (
     # Explicit branch mentions.
-    re.compile(r"\bbranch\s+(?:called|named|with\s+name\s+)?(?P<branch>[_A-Za-z0-9.\-/]+)", re.IGNORECASE),
+    re.compile(rf"\bbranch\s+(?:called|named|with\s+name\s+)?(?P<branch>{_BRANCH_VALUE})", re.IGNORECASE),
     # Create branch phrasing, allow optional article and naming words.
     re.compile(
-        r"\b(?:create|make|new)\s+(?:a\s+)?branch(?:\s+(?:called|named|with\s+name))?\s+(?P<branch>[_A-Za-z0-9.\-/]+)",
+        rf"\b(?:create|make|new)\s+(?:a\s+)?branch(?:\s+(?:called|named|with\s+name))?\s+(?P<branch>{_BRANCH_VALUE})",
         re.IGNORECASE,
     ),
     # Switch/checkout phrasing even with filler words before "branch".
     re.compile(
-        r"\b(?:switch|checkout|change|go)\b.*?\bbranch\s+(?P<branch>[_A-Za-z0-9.\-/]+)",
+        rf"\b(?:switch|checkout|change|go)\b.*?\bbranch\s+(?P<branch>{_BRANCH_VALUE})",
         re.IGNORECASE,
     ),
-    re.compile(r"\b(?:push|publish|send)\s+(?:my\s+)?branch\s+(?P<branch>[_A-Za-z0-9.\-/]+)", re.IGNORECASE),
+    re.compile(rf"\b(?:push|publish|send)\s+(?:my\s+)?branch\s+(?P<branch>{_BRANCH_VALUE})", re.IGNORECASE),
     # Allow extra words between pull verb and origin.
-    re.compile(r"\b(?:pull|sync|update)\b.*?\borigin\s+(?P<branch>[_A-Za-z0-9.\-/]+)", re.IGNORECASE),
-    re.compile(r"\brebase\b.*\b(?:onto|on|with|against)\s+(?P<branch>[_A-Za-z0-9.\-/~^]+)", re.IGNORECASE),
+    re.compile(rf"\b(?:pull|sync|update)\b.*?\borigin\s+(?P<branch>{_BRANCH_VALUE})", re.IGNORECASE),
+    re.compile(rf"\brebase\b.*\b(?:onto|on|with|against)\s+(?P<branch>{_TARGET_VALUE})", re.IGNORECASE),
     # Fallback for terse commands like "checkout main" or "switch develop".
-    re.compile(r"\b(?:checkout|switch|go)\s+(?P<branch>[_A-Za-z0-9.\-/]+)\b", re.IGNORECASE),
-]
+    re.compile(rf"\b(?:checkout|switch|go)\s+(?P<branch>{_BRANCH_VALUE})\b", re.IGNORECASE),
+)
 
-_TARGET_PATTERNS = [
-    re.compile(r"\breset\b.*?\bto\s+(?P<target>[_A-Za-z0-9.\-/~^]+)", re.IGNORECASE),
-    re.compile(r"\breset\s+(?:--)?(?:soft|hard)?\s*(?P<target>[_A-Za-z0-9.\-/~^]+)", re.IGNORECASE),
+_TARGET_PATTERNS = (
+    re.compile(rf"\breset\b.*?\bto\s+(?P<target>{_TARGET_VALUE})", re.IGNORECASE),
+    re.compile(rf"\breset\s+(?:--)?(?:soft|hard)?\s*(?P<target>{_TARGET_VALUE})", re.IGNORECASE),
     re.compile(r"\b(?P<target>HEAD[~^][A-Za-z0-9._\-/~^]*)", re.IGNORECASE),
-]
+)
+
+
+_WORD_BOUNDARY = r"\b"
+# Every entity pattern begins (after its word boundary) with one of these words, so the scan
+# only stops at positions where some pattern could match.
+_PATTERN_LEADS = (
+    "with", "message", "msg", "branch", "create", "make", "new", "switch", "checkout", "change",
+    "go", "push", "publish", "send", "pull", "sync", "update", "rebase", "reset", "head",
+)
+
+
+def _combine_patterns(families: Tuple[Tuple[str, Tuple[re.Pattern[str], ...]], ...]) -> re.Pattern[str]:
+    """Fuse pattern families into one scan; each pattern becomes a lookahead with group `<family>_<i>`.
+
+    Each lookahead is optional rather than an alternative, so a match at a position reports
+    every pattern that matches there (an alternation would hide all but the first). The
+    single pass therefore sees the same candidates as running every pattern separately.
+    Every entity pattern starts at a word boundary, which is hoisted so other positions fail
+    fast.
+    """
+    lookaheads = []
+    for family, patterns in families:
+        for idx, pat in enumerate(patterns):
+            source = pat.pattern.replace(f"(?P<{family}>", f"(?P<{family}_{idx}>")
+            lookaheads.append(f"(?:(?={source.removeprefix(_WORD_BOUNDARY)}))?")
+    gate = "(?=" + "|".join(_PATTERN_LEADS) + ")"
+    return re.compile(_WORD_BOUNDARY + gate + "".join(lookaheads), re.IGNORECASE)
+
+
+# Message, branch and target patterns start on disjoint keywords, so one pass serves all three.
+_ENTITY_SCAN = _combine_patterns(
+    (
+        ("message", (_MESSAGE_PATTERN,)),
+        ("branch", _BRANCH_PATTERNS),
+        ("target", _TARGET_PATTERNS),
+    )
+)
+# Every entity pattern needs one of these literals, so ASCII text containing none of them
+# cannot match and skips the regex scan. Non-ASCII text always scans: casefold does not mirror
+# IGNORECASE (U+0130 matches `i` under IGNORECASE but casefolds to two code points).
+_SCAN_KEYWORDS = ("message", "msg", "branch", "origin", "rebase", "checkout", "switch", "go", "reset", "head")
+# (group index, group name, family) for every pattern in the scan, in pattern order.
+_SCAN_GROUPS = tuple(
+    (index, name, name.rpartition("_")[0])
+    for name, index in sorted(_ENTITY_SCAN.groupindex.items(), key=lambda item: item[1])
+)
+_ENTITY_KEYS = frozenset({"message", "branch", "target"})
+_TARGET_STOPWORDS = frozenset({"everything", "changes", "work"})
+
+
+# Whitespace-separated words made of bare runs and complete quoted runs (shlex posix rules,
+# minus backslash escapes). Quote characters are dropped from each run when unwrapping.
+_SHELL_WORD = re.compile(r"""(?:[^ \t\r\n'"\\]+|"[^"]*"|'[^']*')+""")
+_SHELL_SEGMENT = re.compile(r""""([^"]*)"|'([^']*)'|([^'"]+)""")
 
 
 def _safe_split(text: str) -> Tuple[list[str], bool]:
     """Split respecting quotes; return tokens and whether parsing succeeded."""
+    # Backslashes or stray quotes need shlex's full state machine (and its error on imbalance).
+    if "\\" not in text and not _SHELL_WORD.sub("", text).strip(" \t\r\n"):
+        tokens = []
+        for word in _SHELL_WORD.findall(text):
+            if "'" in word or '"' in word:
+                word = "".join(a or b or c for a, b, c in _SHELL_SEGMENT.findall(word))
+            tokens.append(word)
+        return tokens, True
     try:
         tokens = shlex.split(text, posix=True)
         return tokens, True
@@ -77,6 +146,27 @@ def _set_value(bucket: Dict[str, str], key: str, raw_value: str, validate_ref: b
     bucket[key] = cleaned
 
 
+# One anchored match classifies a flag token: `--flag=value`, a bare flag taking the next
+# token, or a short flag with its value attached (`-mfix`).
+_FLAG_PATTERN = re.compile(
+    r"(?:(?P<inline_flag>--(?:message|branch|target|to|onto))=(?P<inline>.*)"
+    r"|(?P<bare_flag>--(?:message|msg|branch|target|to|onto)|-[mb])"
+    r"|(?P<short_flag>-[mb])(?P<attached>.+))",
+    re.IGNORECASE | re.DOTALL,
+)
+
+_FLAG_ENTITIES = {
+    "--message": "message",
+    "--msg": "message",
+    "-m": "message",
+    "--branch": "branch",
+    "-b": "branch",
+    "--target": "target",
+    "--to": "target",
+    "--onto": "target",
+}
+
+
 def _parse_flags(text: str) -> Tuple[Dict[str, str], str]:
     """Extract entities from CLI-style flags; return (entities, remaining_text)."""
     tokens, _ = _safe_split(text)
@@ -86,46 +176,24 @@ def _parse_flags(text: str) -> Tuple[Dict[str, str], str]:
     i = 0
     while i < len(tokens):
         tok = tokens[i]
-        low = tok.lower()
+        m = _FLAG_PATTERN.fullmatch(tok)
+        if m is None:
+            remaining.append(tok)
+            i += 1
+            continue
 
-        def take_next() -> str | None:
-            nonlocal i
+        flag = m.group("inline_flag") or m.group("bare_flag") or m.group("short_flag")
+        key = _FLAG_ENTITIES[flag.lower()]
+        if m.group("bare_flag"):
+            value = None
             if i + 1 < len(tokens):
                 i += 1
-                return tokens[i]
-            return None
-
-        # Commit message flags.
-        if low.startswith("--message="):
-            _set_value(captured, "message", tok.split("=", 1)[1])
-        elif low in {"--message", "--msg", "-m"}:
-            nxt = take_next()
-            if nxt:
-                _set_value(captured, "message", nxt)
-        elif low.startswith("-m") and len(tok) > 2:
-            _set_value(captured, "message", tok[2:])
-
-        # Branch flags.
-        elif low.startswith("--branch="):
-            _set_value(captured, "branch", tok.split("=", 1)[1], validate_ref=True)
-        elif low in {"--branch", "-b"}:
-            nxt = take_next()
-            if nxt:
-                _set_value(captured, "branch", nxt, validate_ref=True)
-        elif low.startswith("-b") and len(tok) > 2:
-            _set_value(captured, "branch", tok[2:], validate_ref=True)
-
-        # Target flags (reset/rebase target).
-        elif low.startswith("--target=") or low.startswith("--to=") or low.startswith("--onto="):
-            _, _, val = tok.partition("=")
-            _set_value(captured, "target", val, validate_ref=True)
-        elif low in {"--target", "--to", "--onto"}:
-            nxt = take_next()
-            if nxt:
-                _set_value(captured, "target", nxt, validate_ref=True)
-
+                value = tokens[i]
         else:
-            remaining.append(tok)
+            value = m.group("inline") if m.group("inline_flag") else m.group("attached")
+        # Messages are free text; branch and target values must look like git refs.
+        if value:
+            _set_value(captured, key, value, validate_ref=key != "message")
         i += 1
 
     remaining_text = " ".join(remaining).strip()
@@ -134,59 +202,62 @@ def _parse_flags(text: str) -> Tuple[Dict[str, str], str]:
 
 def _apply_patterns(text: str, captured: Dict[str, str]) -> Dict[str, str]:
     """Apply fallback patterns where flags were absent."""
-    if "message" not in captured:
-        msg_match = _MESSAGE_PATTERN.search(text)
-        if msg_match and msg_match.group("message"):
-            _set_value(captured, "message", msg_match.group("message"))
-
-    if "branch" not in captured:
-        best_branch = None
-        best_pos = -1
-        for pat in _BRANCH_PATTERNS:
-            for m in pat.finditer(text):
-                if not m:
-                    continue
-                val = m.group("branch")
-                if not val:
-                    continue
-                cleaned = _strip_wrapping(val)
-                if not _is_valid_ref(cleaned):
-                    continue
-                pos = m.start("branch")
-                if pos >= best_pos:
-                    best_pos = pos
-                    best_branch = cleaned
-        if best_branch:
-            _set_value(captured, "branch", best_branch, validate_ref=False, overwrite=True)
-
-    if "target" not in captured:
-        best_target = None
-        best_pos = -1
-        stopwords = {"everything", "changes", "work"}
-        for pat in _TARGET_PATTERNS:
-            for m in pat.finditer(text):
-                if not m:
-                    continue
-                val = m.group("target")
-                if not val:
-                    continue
-                cleaned = _strip_wrapping(val)
-                if not _is_valid_ref(cleaned):
-                    continue
-                if cleaned.lower() in stopwords:
-                    continue
-                pos = m.start("target")
-                if pos >= best_pos:
-                    best_pos = pos
-                    best_target = cleaned
-        if best_target:
-            _set_value(captured, "target", best_target, validate_ref=False, overwrite=True)
+    if _ENTITY_KEYS <= captured.keys():
+        # Flags already filled every slot; the scan could not change anything.
+        return captured
+    ascii_text = text.isascii()
+    if ascii_text:
+        lowered = text.lower()
+        if not any(keyword in lowered for keyword in _SCAN_KEYWORDS):
+            return captured
+    message = None
+    # Branch/target keep the rightmost valid capture; the message keeps the first match.
+    best: Dict[str, Tuple[int, str | None]] = {"branch": (-1, None), "target": (-1, None)}
+    scan_ends: Dict[str, int] = {}
+    for m in _ENTITY_SCAN.finditer(text):
+        if m.lastindex is None:
+            # A lead word matched but none of the (optional) patterns did.
+            continue
+        for index, group, kind in _SCAN_GROUPS:
+            start = m.start(index)
+            if start < 0:
+                continue
+            # Mirror per-pattern finditer: a pattern never matches inside its own previous match.
+            if m.start() < scan_ends.get(group, 0):
+                continue
+            scan_ends[group] = m.end(index)
+            if kind in captured:
+                continue
+            val = m.group(index)
+            if kind == "message":
+                if message is None:
+                    message = val
+                continue
+            # Branch/target captures contain no quotes, brackets or whitespace, so they never
+            # need stripping. Under IGNORECASE `[A-Za-z]` also matches non-ASCII case folds
+            # (U+0130, U+0131, U+017F, U+212A), so only non-ASCII text can yield an invalid ref.
+            if not ascii_text and not _is_valid_ref(val):
+                continue
+            if kind == "target" and val.lower() in _TARGET_STOPWORDS:
+                continue
+            if start >= best[kind][0]:
+                best[kind] = (start, val)
 
+    if message:
+        _set_value(captured, "message", message)
+    for kind in ("branch", "target"):
+        value = best[kind][1]
+        if value:
+            captured[kind] = value
     return captured
 
 
-def extract_entities(text: str) -> Dict[str, str]:
-    """Extract commit message, branch, and target/ref from user text."""
+@lru_cache(maxsize=1024)
+def extract_entities(text: str) -> Mapping[str, str]:
+    """Extract commit message, branch, and target/ref from user text.
+
+    Results are cached per input and returned read-only; copy before mutating.
+    """
     initial, remaining = _parse_flags(text)
     # Prefer original text for phrase patterns to avoid duplication artifacts.
-    return _apply_patterns(text, initial.copy())
+    return MappingProxyType(_apply_patterns(text, initial.copy()))
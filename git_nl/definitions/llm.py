@@ -2,16 +2,42 @@
 
 from __future__ import annotations
 
+import hashlib
+import http.client
 import json
 import os
-from dataclasses import dataclass
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
 import urllib.error
+import urllib.parse
 import urllib.request
-from typing import List, Tuple
+from typing import Dict, FrozenSet, List, Sequence, Tuple
 
 from git_nl import config
-from .types import IntentResult
+from .semantic import term_vector
+from .types import DATACLASS_SLOTS, IntentResult
+
+try:  # Optional fast JSON codec for request/response bodies; stdlib json is the fallback.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:  # pragma: no cover - depends on the environment
+
+    def _json_dumps(obj: object) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _json_loads = json.loads
 
 # Prompts defined by product to keep the model scoped to intent-only answers.
 SYSTEM_PROMPT = """You are an intent classification engine.
@@ -70,7 +96,29 @@ Return format:
 }}"""
 
 
-@dataclass
+_PARSE_FAILED = "LLM response parse failed"
+
+# System messages are constant, so encode them once at import.
+_SYSTEM_MESSAGE = _json_dumps({"role": "system", "content": SYSTEM_PROMPT})
+_SYSTEM_MESSAGE_MULTI = _json_dumps({"role": "system", "content": SYSTEM_PROMPT_MULTI})
+
+
+@lru_cache(maxsize=16)
+def _intent_lookup(allowed_intents: Tuple[str, ...]) -> Tuple[FrozenSet[str], str]:
+    """Membership set and prompt-ready sorted list; the router passes the same tuple every call."""
+    allowed = frozenset(allowed_intents)
+    return allowed, ", ".join(sorted(allowed))
+
+
+def _coerce_confidence(raw: object) -> float:
+    """Numeric confidence from the reply; anything non-numeric counts as zero."""
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class LLMClauseIntent:
     clause_index: int
     intent: str
@@ -78,6 +126,72 @@ class LLMClauseIntent:
     reason: str = ""
 
 
+def _sparse_dot(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+# Bag-of-words cosine ignores negation: "... but don't keep the changes" scores ~0.92 against
+# "... but keep the changes". A hit also needs the same set of these polarity terms, as they
+# appear after normalization ("don't" -> "do not"; other n't contractions leave a bare "t").
+_POLARITY_TERMS = frozenset(
+    {"not", "no", "never", "nothing", "without", "cannot", "dont", "t", "keep", "discard", "throw"}
+)
+
+
+def _same_polarity(a: Dict[str, float], b: Dict[str, float]) -> bool:
+    return (a.keys() & _POLARITY_TERMS) == (b.keys() & _POLARITY_TERMS)
+
+
+class _SemanticResultCache:
+    """LLM classifications reused for near-duplicate phrasings; LRU-bounded with a TTL."""
+
+    # Above this similarity a new result replaces the stored one instead of adding an entry.
+    _REPLACE_SIMILARITY = 0.95
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (scope, term vector, result, stored_at), least recently used first.
+        self._entries: List[Tuple[tuple, Dict[str, float], IntentResult, float]] = []
+
+    def get(self, scope: tuple, vector: Dict[str, float], threshold: float) -> IntentResult | None:
+        with self._lock:
+            now = time.monotonic()
+            self._entries = [entry for entry in self._entries if now - entry[3] < self.ttl]
+            best_idx, best_score = -1, threshold
+            for idx, (entry_scope, entry_vector, _, _) in enumerate(self._entries):
+                if entry_scope != scope or not _same_polarity(vector, entry_vector):
+                    continue
+                score = _sparse_dot(vector, entry_vector)
+                if score >= best_score:
+                    best_idx, best_score = idx, score
+            if best_idx < 0:
+                return None
+            entry = self._entries.pop(best_idx)
+            self._entries.append(entry)
+            return entry[2]
+
+    def put(self, scope: tuple, vector: Dict[str, float], result: IntentResult) -> None:
+        with self._lock:
+            for idx, (entry_scope, entry_vector, _, _) in enumerate(self._entries):
+                if (
+                    entry_scope == scope
+                    and _same_polarity(vector, entry_vector)
+                    and _sparse_dot(vector, entry_vector) > self._REPLACE_SIMILARITY
+                ):
+                    del self._entries[idx]
+                    break
+            self._entries.append((scope, vector, result, time.monotonic()))
+            if len(self._entries) > self.maxsize:
+                del self._entries[0]
+
+
+_SEMANTIC_CACHE = _SemanticResultCache(maxsize=config.LLM_SEMANTIC_CACHE_SIZE, ttl=config.LLM_SEMANTIC_CACHE_TTL)
+
+
 class LLMIntentDetector:
     """Calls a fast LLM to classify intents when deterministic paths fail."""
 
@@ -93,8 +207,15 @@ class LLMIntentDetector:
         self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
         self.api_base = (api_base or os.getenv("OPENROUTER_BASE_URL") or "https://openrouter.ai/api/v1").rstrip("/")
         self.timeout = timeout
-
-    def detect(self, text: str, allowed_intents: List[str]) -> Tuple[IntentResult | None, str]:
+        # Recent round-trip latencies; a slow provider gets a timeout of twice its p95, never below
+        # the base and never above config.LLM_MAX_TIMEOUT.
+        self._latency_window: "deque[float]" = deque(maxlen=32)
+        self._latency_lock = threading.Lock()
+        # Static request fields are serialized once; the open "messages" array is completed per call.
+        static_fields = {"model": self.model, "temperature": 0, "response_format": {"type": "json_object"}}
+        self._request_prefix = _json_dumps(static_fields)[:-1] + b', "messages": ['
+
+    def detect(self, text: str, allowed_intents: Sequence[str]) -> Tuple[IntentResult | None, str]:
         """Return an IntentResult when the LLM returns a recognized intent."""
         if not allowed_intents:
             return None, "LLM fallback skipped: no allowed intents provided."
@@ -102,30 +223,26 @@ class LLMIntentDetector:
         if not self.api_key:
             return None, "LLM fallback skipped: OPENROUTER_API_KEY not set."
 
+        # Near-duplicate phrasings reuse a recent classification; entities are re-extracted by the caller.
+        allowed_key = tuple(allowed_intents)
+        allowed_set, allowed_prompt = _intent_lookup(allowed_key)
+        cache_scope = (self.api_base, self.model, allowed_key)
+        vector = term_vector(text)
+        if vector:
+            cached = _SEMANTIC_CACHE.get(cache_scope, vector, config.LLM_SEMANTIC_CACHE_THRESHOLD)
+            if cached is not None:
+                return replace(cached, entities={}), "LLM classification reused from semantic cache."
+
         user_prompt = USER_PROMPT_TEMPLATE.format(
             user_input=text.strip(),
-            allowed_intents=", ".join(sorted(set(allowed_intents))),
+            allowed_intents=allowed_prompt,
         )
-        payload = {
-            "model": self.model,
-            "temperature": 0,
-            "response_format": {"type": "json_object"},
-            "messages": [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-        }
-
-        structured, error = self._call_llm(payload)
+        structured, error = self._call_llm(self._encode_request(_SYSTEM_MESSAGE, user_prompt))
         if error:
             return None, error
 
         intent = structured.get("intent")
-        confidence_raw = structured.get("confidence", 0.0)
-        try:
-            confidence = float(confidence_raw)
-        except (TypeError, ValueError):
-            confidence = 0.0
+        confidence = _coerce_confidence(structured.get("confidence", 0.0))
 
         if not isinstance(intent, str):
             return None, "LLM response missing intent string."
@@ -133,27 +250,28 @@ class LLMIntentDetector:
         if intent == "unknown":
             return None, "LLM returned unknown."
 
-        if intent not in allowed_intents:
+        if intent not in allowed_set:
             return None, f"LLM intent '{intent}' not in allowed list."
+        # Decoded JSON strings are fresh objects; intern so downstream intent compares hit the identity fast path.
+        intent = sys.intern(intent)
 
-        if not 0.0 <= confidence <= 1.0:
-            confidence = 0.0
-
+        # Out-of-range scores (e.g. percentages) mean a malformed reply, so they count as zero, not 1.0.
+        confidence = confidence if 0.0 <= confidence <= 1.0 else 0.0
         if confidence < config.LLM_CONFIDENCE_THRESHOLD:
             return None, f"LLM confidence {confidence:.2f} below threshold {config.LLM_CONFIDENCE_THRESHOLD:.2f}."
 
-        return (
-            IntentResult(
-                intent=intent,
-                confidence=confidence,
-                source="llm",
-                entities={},
-                reason=f"LLM ({self.model}) classified intent '{intent}' with confidence {confidence:.2f}.",
-            ),
-            "LLM classified intent.",
+        result = IntentResult(
+            intent=intent,
+            confidence=confidence,
+            source="llm",
+            entities={},
+            reason=f"LLM ({self.model}) classified intent '{intent}' with confidence {confidence:.2f}.",
         )
+        if vector:
+            _SEMANTIC_CACHE.put(cache_scope, vector, replace(result))
+        return result, "LLM classified intent."
 
-    def detect_many(self, clauses: List[str], allowed_intents: List[str]) -> Tuple[List[LLMClauseIntent] | None, str]:
+    def detect_many(self, clauses: List[str], allowed_intents: Sequence[str]) -> Tuple[List[LLMClauseIntent] | None, str]:
         """Return ordered clause intents for multi-intent fallback."""
         if not clauses:
             return None, "LLM fallback skipped: no clauses provided."
@@ -164,38 +282,25 @@ class LLMIntentDetector:
         if not self.api_key:
             return None, "LLM fallback skipped: OPENROUTER_API_KEY not set."
 
+        allowed_set, allowed_prompt = _intent_lookup(tuple(allowed_intents))
         clause_lines = "\n".join(f"{idx}: {clause}" for idx, clause in enumerate(clauses))
         user_prompt = USER_PROMPT_TEMPLATE_MULTI.format(
             clauses=clause_lines,
-            allowed_intents=", ".join(sorted(set(allowed_intents))),
+            allowed_intents=allowed_prompt,
         )
-        payload = {
-            "model": self.model,
-            "temperature": 0,
-            "response_format": {"type": "json_object"},
-            "messages": [
-                {"role": "system", "content": SYSTEM_PROMPT_MULTI},
-                {"role": "user", "content": user_prompt},
-            ],
-        }
-
-        structured, error = self._call_llm(payload)
+        structured, error = self._call_llm(self._encode_request(_SYSTEM_MESSAGE_MULTI, user_prompt))
         if error:
+            if error.startswith(_PARSE_FAILED) and len(clauses) > 1:
+                return self._detect_each(clauses, allowed_intents, error)
             return None, error
 
         intents = structured.get("intents")
         if not isinstance(intents, list):
+            if len(clauses) > 1:
+                return self._detect_each(clauses, allowed_intents, "LLM response missing intents list.")
             return None, "LLM response missing intents list."
 
-        result_map: dict[int, LLMClauseIntent] = {}
-        for idx in range(len(clauses)):
-            result_map[idx] = LLMClauseIntent(
-                clause_index=idx,
-                intent="unknown",
-                confidence=0.0,
-                reason="LLM did not return an intent for this clause.",
-            )
-
+        results: List[LLMClauseIntent | None] = [None] * len(clauses)
         for item in intents:
             if not isinstance(item, dict):
                 continue
@@ -206,11 +311,7 @@ class LLMIntentDetector:
                 continue
 
             intent = item.get("intent")
-            confidence_raw = item.get("confidence", 0.0)
-            try:
-                confidence = float(confidence_raw)
-            except (TypeError, ValueError):
-                confidence = 0.0
+            confidence = _coerce_confidence(item.get("confidence", 0.0))
 
             if not isinstance(intent, str):
                 intent = "unknown"
@@ -218,7 +319,7 @@ class LLMIntentDetector:
             if intent == "unknown":
                 reason = "LLM returned unknown."
                 result = LLMClauseIntent(clause_index=clause_index, intent="unknown", confidence=confidence, reason=reason)
-            elif intent not in allowed_intents:
+            elif intent not in allowed_set:
                 reason = f"LLM intent '{intent}' not in allowed list."
                 result = LLMClauseIntent(clause_index=clause_index, intent="unknown", confidence=confidence, reason=reason)
             elif not 0.0 <= confidence <= 1.0:
@@ -229,61 +330,219 @@ class LLMIntentDetector:
                 result = LLMClauseIntent(clause_index=clause_index, intent="unknown", confidence=confidence, reason=reason)
             else:
                 reason = f"LLM ({self.model}) classified intent '{intent}' with confidence {confidence:.2f}."
-                result = LLMClauseIntent(clause_index=clause_index, intent=intent, confidence=confidence, reason=reason)
+                result = LLMClauseIntent(
+                    clause_index=clause_index, intent=sys.intern(intent), confidence=confidence, reason=reason
+                )
 
-            existing = result_map.get(clause_index)
+            existing = results[clause_index]
             if existing and existing.intent != "unknown" and result.intent == "unknown":
                 continue
             if existing and existing.intent != "unknown" and result.intent != "unknown":
                 if result.confidence <= existing.confidence:
                     continue
-            result_map[clause_index] = result
+            results[clause_index] = result
 
-        ordered = [result_map[idx] for idx in range(len(clauses))]
+        ordered = [
+            result
+            or LLMClauseIntent(
+                clause_index=idx,
+                intent="unknown",
+                confidence=0.0,
+                reason="LLM did not return an intent for this clause.",
+            )
+            for idx, result in enumerate(results)
+        ]
         return ordered, "LLM classified intents."
 
-    def _call_llm(self, payload: dict) -> Tuple[dict | None, str | None]:
-        try:
-            req = urllib.request.Request(
-                url=f"{self.api_base}/chat/completions",
-                data=json.dumps(payload).encode("utf-8"),
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.api_key}",
-                },
-                method="POST",
-            )
-            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                body = resp.read().decode("utf-8")
-        except urllib.error.HTTPError as exc:
-            return None, f"LLM HTTP error {exc.code}: {exc.reason}"
-        except urllib.error.URLError as exc:
-            return None, f"LLM network error: {exc.reason}"
-        except Exception as exc:  # pragma: no cover - defensive
-            return None, f"LLM call failed: {exc}"
+    def _detect_each(
+        self, clauses: List[str], allowed_intents: Sequence[str], batch_error: str
+    ) -> Tuple[List[LLMClauseIntent] | None, str]:
+        """Classify clauses concurrently, one request each, after an unusable batched answer."""
+        with ThreadPoolExecutor(max_workers=min(len(clauses), _POOL_MAXSIZE)) as pool:
+            outcomes = list(pool.map(lambda clause: self.detect(clause, allowed_intents), clauses))
+
+        results: List[LLMClauseIntent] = []
+        for idx, (result, reason) in enumerate(outcomes):
+            if result is None:
+                results.append(LLMClauseIntent(clause_index=idx, intent="unknown", confidence=0.0, reason=reason))
+            else:
+                results.append(
+                    LLMClauseIntent(
+                        clause_index=idx, intent=result.intent, confidence=result.confidence, reason=result.reason
+                    )
+                )
+        if all(item.intent == "unknown" for item in results):
+            return None, f"{batch_error} Per-clause fallback: {outcomes[0][1]}"
+        return results, "LLM classified intents per clause."
+
+    def _encode_request(self, system_message: bytes, user_prompt: str) -> bytes:
+        """Splice the per-call user message into the pre-encoded request skeleton."""
+        user_message = _json_dumps({"role": "user", "content": user_prompt})
+        return b"".join((self._request_prefix, system_message, b", ", user_message, b"]}"))
+
+    def _request_timeout(self) -> float:
+        with self._latency_lock:
+            window = sorted(self._latency_window)
+        if not window:
+            return self.timeout
+        p95 = window[min(len(window) - 1, int(len(window) * 0.95))]
+        # A few pathological round trips must not stretch every later call without bound.
+        return max(self.timeout, min(2 * p95, config.LLM_MAX_TIMEOUT))
+
+    def _record_latency(self, elapsed: float) -> None:
+        with self._latency_lock:
+            self._latency_window.append(elapsed)
+
+    def _call_llm(self, data: bytes) -> Tuple[dict | None, str | None]:
+        cache_key = hashlib.blake2b(self.api_base.encode("utf-8") + b"\x00" + data, digest_size=16).digest()
+        with _RESPONSE_CACHE_LOCK:
+            cached = _RESPONSE_CACHE.get(cache_key)
+            if cached is not None:
+                _RESPONSE_CACHE.move_to_end(cache_key)
+        if cached is not None:
+            return cached, None
+
+        attempts = max(1, config.LLM_MAX_ATTEMPTS)
+        for attempt in range(attempts):
+            started = time.perf_counter()
+            try:
+                status, reason, body = _post(
+                    url=f"{self.api_base}/chat/completions",
+                    data=data,
+                    headers={
+                        "Content-Type": "application/json",
+                        "Authorization": f"Bearer {self.api_key}",
+                    },
+                    timeout=self._request_timeout(),
+                )
+                break
+            except urllib.error.HTTPError as exc:
+                return None, f"LLM HTTP error {exc.code}: {exc.reason}"
+            except (urllib.error.URLError, OSError) as exc:
+                if attempt + 1 < attempts and _is_retryable(exc):
+                    time.sleep(config.LLM_RETRY_BACKOFF * 2**attempt)
+                    continue
+                detail = exc.reason if isinstance(exc, urllib.error.URLError) else exc
+                return None, f"LLM network error: {detail}"
+            except Exception as exc:  # pragma: no cover - defensive
+                return None, f"LLM call failed: {exc}"
+        self._record_latency(time.perf_counter() - started)
+
+        if not 200 <= status < 300:
+            return None, f"LLM HTTP error {status}: {reason}"
 
         try:
-            parsed = json.loads(body)
+            # Both JSON codecs decode UTF-8 bytes directly; no intermediate str copy.
+            parsed = _json_loads(body)
             content = parsed["choices"][0]["message"]["content"]
-            structured = json.loads(content)
+            structured = _json_loads(content)
         except Exception as exc:
-            return None, f"LLM response parse failed: {exc}"
+            return None, f"{_PARSE_FAILED}: {exc}"
 
+        if isinstance(structured, dict):
+            with _RESPONSE_CACHE_LOCK:
+                _RESPONSE_CACHE[cache_key] = structured
+                while len(_RESPONSE_CACHE) > config.LLM_CACHE_SIZE:
+                    _RESPONSE_CACHE.popitem(last=False)
         return structured, None
 
 
+def _is_retryable(exc: BaseException) -> bool:
+    """Connection-level failures are worth another attempt; timeouts already spent the budget."""
+    cause = exc.reason if isinstance(exc, urllib.error.URLError) else exc
+    return isinstance(cause, OSError) and not isinstance(cause, (socket.timeout, TimeoutError))
+
+
+# Successful classifications keyed on the full request (model, prompts, allowed intents); LRU-evicted.
+# Per-clause fallback calls run on worker threads, so lookups and stores hold the lock.
+_RESPONSE_CACHE: "OrderedDict[bytes, dict]" = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+# Idle keep-alive connections per (scheme, host) so repeat LLM calls skip the TCP/TLS handshake.
+# A connection is checked out for one request at a time, so concurrent callers never share a socket.
+_POOL_MAXSIZE = 16
+_IDLE_CONNECTIONS: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _acquire_connection(scheme: str, netloc: str, timeout: float) -> http.client.HTTPConnection:
+    with _POOL_LOCK:
+        idle = _IDLE_CONNECTIONS.get((scheme, netloc))
+        conn = idle.pop() if idle else None
+    if conn is None:
+        conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = conn_cls(netloc, timeout=timeout)
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn
+
+
+def _release_connection(scheme: str, netloc: str, conn: http.client.HTTPConnection) -> None:
+    with _POOL_LOCK:
+        idle = _IDLE_CONNECTIONS.setdefault((scheme, netloc), [])
+        if len(idle) < _POOL_MAXSIZE:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+def _post(url: str, data: bytes, headers: Dict[str, str], timeout: float) -> Tuple[int, str, bytes]:
+    """POST over a pooled keep-alive connection; return (status, reason, raw body bytes)."""
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in {"http", "https"} or (
+        urllib.request.getproxies().get(parts.scheme) and not urllib.request.proxy_bypass(parts.hostname or "")
+    ):
+        # Proxies and exotic schemes keep the stock urllib path.
+        return _urlopen_post(url, data, headers, timeout)
+
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    while True:
+        conn = _acquire_connection(parts.scheme, parts.netloc, timeout)
+        reused = conn.sock is not None
+        try:
+            conn.request("POST", path, body=data, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if reused:
+                # The server dropped an idle keep-alive socket; retry on another connection.
+                continue
+            raise
+        except Exception:
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            _release_connection(parts.scheme, parts.netloc, conn)
+        if 300 <= resp.status < 400:
+            # http.client does not follow redirects; let urllib handle them as it always did.
+            return _urlopen_post(url, data, headers, timeout)
+        return resp.status, resp.reason, body
+
+
+def _urlopen_post(url: str, data: bytes, headers: Dict[str, str], timeout: float) -> Tuple[int, str, bytes]:
+    req = urllib.request.Request(url=url, data=data, headers=headers, method="POST")
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.status, resp.reason, resp.read()
+
+
+_ENV_PATH = Path(__file__).resolve().parents[2] / ".env"
+
+
+@lru_cache(maxsize=None)
 def _load_env_from_file() -> None:
-    """Load .env from repository root into os.environ if present."""
-    env_path = Path(__file__).resolve().parents[2] / ".env"
-    if not env_path.exists():
+    """Load .env from repository root into os.environ if present (once per process)."""
+    if not _ENV_PATH.exists():
         return
 
-    for line in env_path.read_text().splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#") or "=" not in stripped:
-            continue
-        key, _, value = stripped.partition("=")
-        key = key.strip()
-        value = value.strip().strip('"').strip("'")
-        if key and key not in os.environ:
-            os.environ[key] = value
+    lines = (line.strip() for line in _ENV_PATH.read_text().splitlines())
+    pairs = [line.partition("=") for line in lines if line and not line.startswith("#") and "=" in line]
+    # Walk backwards so the first assignment of a repeated key wins, as before.
+    values = {key.strip(): value.strip().strip('"').strip("'") for key, _, value in reversed(pairs)}
+    os.environ.update({key: value for key, value in values.items() if key and key not in os.environ})
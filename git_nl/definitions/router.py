@@ -1,14 +1,20 @@
 """Intent routing orchestrating rule, semantic, and LLM fallback (stubs)."""
 
-from typing import Optional
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Optional
 import re
+import sys
 
 from git_nl import config
-from .llm import LLMClauseIntent, LLMIntentDetector
 from .rule_definitions import RuleBasedIntentDetector, extract_entities_for_intent
-from .semantic import SEMANTIC_DETECTOR, SemanticIntentDetector
+from .semantic import SEMANTIC_DETECTOR, SemanticIntentDetector, meets_threshold
 from .types import IntentResult
 
+if TYPE_CHECKING:  # pragma: no cover - the LLM stack is imported only when a fallback is needed
+    from .llm import LLMClauseIntent, LLMIntentDetector
+
 
 _CLAUSE_SPLIT_PATTERN = re.compile(
     r"\b(?:and then|after that|afterwards|then|and|next)\b|;",
@@ -16,28 +22,20 @@ _CLAUSE_SPLIT_PATTERN = re.compile(
 )
 
 
+# A quote runs to the next occurrence of the same character; an unclosed quote swallows the rest
+# of the text (the "open" branch) and yields no span, matching the old character-by-character scan.
+_QUOTE_SPAN_PATTERN = re.compile(r"""(['"`])(?:.*?\1|(?P<open>.*))""", re.DOTALL)
+
+
 def _find_quote_spans(text: str) -> list[tuple[int, int]]:
-    spans: list[tuple[int, int]] = []
-    in_quote: str | None = None
-    start: int | None = None
-    for idx, ch in enumerate(text):
-        if in_quote:
-            if ch == in_quote:
-                spans.append((start or 0, idx + 1))
-                in_quote = None
-                start = None
-        elif ch in {"'", '"', "`"}:
-            in_quote = ch
-            start = idx
-    return spans
-
-
-def _overlaps_quotes(span: tuple[int, int], quote_spans: list[tuple[int, int]]) -> bool:
+    return [match.span() for match in _QUOTE_SPAN_PATTERN.finditer(text) if match.group("open") is None]
+
+
+def _overlaps_quotes(span: tuple[int, int], quote_spans: list[tuple[int, int]], quote_ends: list[int]) -> bool:
+    # Quote spans are disjoint and ascending, so the first one ending after ``start`` is the only candidate.
     start, end = span
-    for q_start, q_end in quote_spans:
-        if start < q_end and end > q_start:
-            return True
-    return False
+    idx = bisect_right(quote_ends, start)
+    return idx < len(quote_spans) and end > quote_spans[idx][0]
 
 
 def split_clauses(text: str) -> list[str]:
@@ -47,21 +45,21 @@ def split_clauses(text: str) -> list[str]:
         return []
 
     quote_spans = _find_quote_spans(text)
-    split_spans: list[tuple[int, int]] = []
-    for match in _CLAUSE_SPLIT_PATTERN.finditer(text):
-        if not _overlaps_quotes(match.span(), quote_spans):
-            split_spans.append(match.span())
-
-    if not split_spans:
-        return [stripped]
-
+    quote_ends = [q_end for _, q_end in quote_spans]
     clauses: list[str] = []
     start = 0
-    for span_start, span_end in split_spans:
-        clause = text[start:span_start].strip(" ,;")
+    for match in _CLAUSE_SPLIT_PATTERN.finditer(text):
+        span = match.span()
+        if quote_spans and _overlaps_quotes(span, quote_spans, quote_ends):
+            continue
+        clause = text[start : span[0]].strip(" ,;")
         if clause:
             clauses.append(clause)
-        start = span_end
+        start = span[1]
+
+    if not start:
+        return [stripped]
+
     tail = text[start:].strip(" ,;")
     if tail:
         clauses.append(tail)
@@ -78,11 +76,28 @@ class IntentRouter:
     ) -> None:
         self.rule_detector = RuleBasedIntentDetector()
         self.semantic_detector = semantic_detector
-        self.llm_detector = llm_detector or LLMIntentDetector()
-        self.allowed_intents = sorted(
-            {rule.intent for rule in self.rule_detector.rules} | set(self.semantic_detector.catalog.keys())
+        self._llm_detector = llm_detector
+        # Frozen once per router: a sorted tuple of interned names is passed straight through to the LLM.
+        self.allowed_intents: tuple[str, ...] = tuple(
+            sorted(
+                sys.intern(intent)
+                for intent in {rule.intent for rule in self.rule_detector.rules} | set(self.semantic_detector.catalog)
+            )
         )
 
+    @property
+    def llm_detector(self) -> LLMIntentDetector:
+        """LLM fallback detector, created on first use so deterministic routes skip its import."""
+        if self._llm_detector is None:
+            from .llm import LLMIntentDetector
+
+            self._llm_detector = LLMIntentDetector()
+        return self._llm_detector
+
+    @llm_detector.setter
+    def llm_detector(self, detector: LLMIntentDetector) -> None:
+        self._llm_detector = detector
+
     def route(self, text: str) -> IntentResult:
         """Route to the first confident intent. Semantic/LLM are placeholders."""
         rule_result = self.rule_detector.detect(text)
@@ -98,7 +113,7 @@ class IntentRouter:
         else:
             threshold = config.SEMANTIC_CONFIDENCE_THRESHOLD
 
-        if semantic_match and semantic_match.score >= threshold:
+        if semantic_match and meets_threshold(semantic_match.score, threshold):
             return IntentResult(
                 intent=semantic_match.intent,
                 confidence=semantic_match.score,
@@ -134,7 +149,7 @@ class IntentRouter:
         )
 
     def route_many(self, text: str) -> list[IntentResult]:
-        """Route multiple clauses sequentially with LLM fallback when any clause fails."""
+        """Route clauses deterministically, batching only the unresolved ones into one LLM call."""
         clauses = split_clauses(text)
         if not clauses:
             return [
@@ -149,14 +164,14 @@ class IntentRouter:
             return [self.route(clauses[0])]
 
         results: list[IntentResult] = []
-        needs_llm = False
-        for clause in clauses:
+        pending: list[int] = []
+        for idx, clause in enumerate(clauses):
             result, confident = self._route_clause_deterministic(clause)
             results.append(result)
             if not confident:
-                needs_llm = True
+                pending.append(idx)
 
-        if not needs_llm:
+        if not pending:
             return results
 
         if not config.ENABLE_LLM_FALLBACK:
@@ -165,7 +180,9 @@ class IntentRouter:
                     res.reason = f"{res.reason} LLM fallback: disabled."
             return results
 
-        llm_results, llm_reason = self.llm_detector.detect_many(clauses, allowed_intents=self.allowed_intents)
+        # One batched LLM call covers every unresolved clause; confident clauses keep their result.
+        pending_clauses = [clauses[idx] for idx in pending]
+        llm_results, llm_reason = self.llm_detector.detect_many(pending_clauses, allowed_intents=self.allowed_intents)
         if not llm_results:
             for res in results:
                 if res.intent == "unknown":
@@ -173,30 +190,26 @@ class IntentRouter:
             return results
 
         ordered: list[LLMClauseIntent] = sorted(llm_results, key=lambda item: item.clause_index)
-        final_results: list[IntentResult] = []
         for item in ordered:
-            clause_text = clauses[item.clause_index]
+            clause_index = pending[item.clause_index]
+            clause_text = clauses[clause_index]
             if item.intent == "unknown":
-                final_results.append(
-                    IntentResult(
-                        intent="unknown",
-                        confidence=0.0,
-                        source="llm",
-                        reason=item.reason,
-                    )
+                results[clause_index] = IntentResult(
+                    intent="unknown",
+                    confidence=0.0,
+                    source="llm",
+                    reason=item.reason,
                 )
             else:
                 entities = extract_entities_for_intent(item.intent, clause_text)
-                final_results.append(
-                    IntentResult(
-                        intent=item.intent,
-                        confidence=item.confidence,
-                        source="llm",
-                        entities=entities,
-                        reason=item.reason,
-                    )
+                results[clause_index] = IntentResult(
+                    intent=item.intent,
+                    confidence=item.confidence,
+                    source="llm",
+                    entities=entities,
+                    reason=item.reason,
                 )
-        return final_results
+        return results
 
     def _route_clause_deterministic(self, clause: str) -> tuple[IntentResult, bool]:
         rule_result = self.rule_detector.detect(clause)
@@ -211,7 +224,7 @@ class IntentRouter:
         else:
             threshold = config.SEMANTIC_CONFIDENCE_THRESHOLD
 
-        if semantic_match and semantic_match.score >= threshold:
+        if semantic_match and meets_threshold(semantic_match.score, threshold):
             return (
                 IntentResult(
                     intent=semantic_match.intent,
@@ -2,36 +2,46 @@
 
 import re
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Pattern
+from functools import lru_cache
+from typing import AbstractSet, Dict, FrozenSet, List, Optional, Pattern, Sequence, Tuple
 
 from git_nl import config
 from .entity_extractor import extract_entities
-from .types import IntentResult
+from .types import DATACLASS_SLOTS, IntentResult
 
 
-def _normalize(text: str) -> str:
-    """Lowercase, strip punctuation, collapse whitespace for deterministic matching."""
-    CONTRACTIONS = {
-        "i've": "i have",
-        "ive": "i have",
-        "can't": "cannot",
-        "don't": "do not",
-    }
+_CONTRACTIONS = {
+    "i've": "i have",
+    "ive": "i have",
+    "can't": "cannot",
+    "don't": "do not",
+}
+_CONTRACTIONS_PATTERN = re.compile(r"\b(" + "|".join(re.escape(k) for k in _CONTRACTIONS) + r")\b")
+# Runs of whitespace and disallowed characters collapse to one space in a single pass.
+_SEPARATOR_PATTERN = re.compile(r"[^a-z0-9\-/\.]+")
 
-    lowered = text.lower()
-    for k, v in CONTRACTIONS.items():
-        lowered = re.sub(rf"\b{k}\b", v, lowered)
 
-    cleaned = re.sub(r"[^a-z0-9\s\-/\.]", " ", lowered)
-    return re.sub(r"\s+", " ", cleaned).strip()
+@lru_cache(maxsize=2048)
+def _normalize(text: str) -> str:
+    """Lowercase, strip punctuation, collapse whitespace for deterministic matching."""
+    lowered = _CONTRACTIONS_PATTERN.sub(lambda m: _CONTRACTIONS[m.group(1)], text.lower())
+    return _SEPARATOR_PATTERN.sub(" ", lowered).strip()
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RuleDefinition:
     intent: str
-    exact_phrases: List[str] = field(default_factory=list)
-    fullmatch_regexes: List[Pattern[str]] = field(default_factory=list)
+    exact_phrases: AbstractSet[str] = frozenset()
+    fullmatch_regexes: Sequence[Pattern[str]] = ()
     reason: str = ""
+    # Reason reported on a match, resolved once instead of formatted per detect() call.
+    match_reason: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Rules are fixed once built: phrases become a frozenset (O(1) membership), regexes a tuple.
+        self.exact_phrases = frozenset(self.exact_phrases)
+        self.fullmatch_regexes = tuple(self.fullmatch_regexes)
+        self.match_reason = self.reason or f"Rule matched for intent '{self.intent}'."
 
     def matches(self, normalized_text: str) -> bool:
         """Return True only when there is an exact phrase or full-string regex match."""
@@ -43,65 +53,152 @@ class RuleDefinition:
         return False
 
 
+# Every rule regex needs at least one of these words, so text containing none of them cannot
+# fullmatch the fused alternation. Keep in sync with the regexes in _build_rules.
+_RULE_KEYWORDS = (
+    "commit", "save", "record", "push", "send", "publish", "create", "make", "new",
+    "switch", "checkout", "change", "go", "pull", "sync", "update", "stash", "rebase",
+    "reset", "undo", "revert", "discard", "drop",
+)
+_RULE_KEYWORD_SEARCH = re.compile("|".join(_RULE_KEYWORDS)).search
+
+
+# Any capturing group opener, named or not (the rule patterns contain no escaped parentheses).
+_CAPTURING_GROUP = re.compile(r"\((?:\?P<\w+>)?(?!\?)")
+
+
+def _combine_rule_regexes(rules: Sequence[RuleDefinition]) -> Tuple[Pattern[str], Dict[str, int]]:
+    """Fuse every rule regex into one ordered alternation with one named group per rule.
+
+    Groups keep rule order, so the first group that fullmatches belongs to the rule the
+    per-rule loop would have hit first, and ``lastgroup`` is that rule's intent. Inner
+    groups are made non-capturing (entities come from the extractor), which keeps the
+    intent group the only capture.
+    """
+    groups: List[str] = []
+    group_rank: Dict[str, int] = {}
+    for rank, rule in enumerate(rules):
+        if not rule.fullmatch_regexes:
+            continue
+        group_rank[rule.intent] = rank
+        body = "|".join(_CAPTURING_GROUP.sub("(?:", pattern.pattern) for pattern in rule.fullmatch_regexes)
+        groups.append(f"(?P<{rule.intent}>{body})")
+    return re.compile("|".join(groups)), group_rank
+
+
+# Intents that fall back to config.DEFAULT_BRANCH when the user omits a branch name.
+_BRANCH_INTENTS = frozenset({"create_branch", "switch_branch", "push_branch", "pull_origin", "rebase_branch"})
+
+
+@lru_cache(maxsize=8)
+def _missing_branch_reason(default_branch: str) -> str:
+    return f"Branch name not provided; defaulting to '{default_branch}' unless a name is specified."
+
+
 # Entities we care about per intent (used to filter extractor output).
-_ALLOWED_ENTITIES: Dict[str, set[str]] = {
-    "commit_changes": {"message"},
-    "stash_changes": {"message"},
-    "create_branch": {"branch"},
-    "switch_branch": {"branch"},
-    "push_branch": {"branch"},
-    "pull_origin": {"branch"},
-    "rebase_branch": {"branch"},
-    "reset_soft": {"target"},
-    "reset_hard": {"target"},
-    "push_commit_to_origin": set(),
-    "undo_commit_soft": set(),
+_ALLOWED_ENTITIES: Dict[str, FrozenSet[str]] = {
+    "commit_changes": frozenset({"message"}),
+    "stash_changes": frozenset({"message"}),
+    "create_branch": frozenset({"branch"}),
+    "switch_branch": frozenset({"branch"}),
+    "push_branch": frozenset({"branch"}),
+    "pull_origin": frozenset({"branch"}),
+    "rebase_branch": frozenset({"branch"}),
+    "reset_soft": frozenset({"target"}),
+    "reset_hard": frozenset({"target"}),
+    "push_commit_to_origin": frozenset(),
+    "undo_commit_soft": frozenset(),
     # Intents without entities keep the extractor output empty.
 }
 
 
 def extract_entities_for_intent(intent: str, text: str) -> Dict[str, str]:
     """Extract entities and filter them to the fields allowed for the intent."""
-    all_entities = extract_entities(text)
     allowed = _ALLOWED_ENTITIES.get(intent)
-    if allowed is None:
-        return all_entities
-    if not allowed:
+    if allowed is not None and not allowed:
+        # Entity-free intents never need the extractor pass.
         return {}
+    all_entities = extract_entities(text)
+    if allowed is None:
+        return dict(all_entities)
+    if len(allowed) == 1:
+        # Every entity-bearing intent keeps exactly one field; probe it directly.
+        (key,) = allowed
+        return {key: all_entities[key]} if key in all_entities else {}
     return {k: v for k, v in all_entities.items() if k in allowed}
 
 
+# (rules, fused regex, intent -> rule, exact phrase -> winning rule), shared per detector class.
+_RuleTable = Tuple[Tuple[RuleDefinition, ...], Pattern[str], Dict[str, RuleDefinition], Dict[str, RuleDefinition]]
+_RULE_TABLES: Dict[type, _RuleTable] = {}
+
+
 class RuleBasedIntentDetector:
     """Deterministic, low-latency intent detector using keywords and patterns."""
 
     def __init__(self) -> None:
-        self.rules = self._build_rules()
+        # Rules and their compiled tables never change, so build them once per detector class
+        # and share them; each instance still gets its own (patchable) methods and match memo.
+        table = _RULE_TABLES.get(type(self))
+        if table is None:
+            table = _RULE_TABLES[type(self)] = self._build_rule_table()
+        self.rules, self._master, self._rule_by_intent, self._phrase_index = table
+        self._master_fullmatch = self._master.fullmatch
+        # The rule set never changes after construction, so the lookup is a pure function of the
+        # normalized text; memoize it per instance so repeated clauses skip the regex engine.
+        self._match_rule = lru_cache(maxsize=2048)(self._match_rule)
+
+    def _build_rule_table(self) -> _RuleTable:
+        rules = tuple(self._build_rules())
+        master, group_rank = _combine_rule_regexes(rules)
+        rule_by_intent = {rule.intent: rule for rule in rules}
+        # Exact phrases are a fixed set, so resolve each one to its winning rule up front: an
+        # earlier rule's regex still takes precedence over the rule that owns the phrase.
+        phrase_index: Dict[str, RuleDefinition] = {}
+        for rank, rule in enumerate(rules):
+            for phrase in rule.exact_phrases:
+                if phrase not in phrase_index:
+                    match = master.fullmatch(phrase)
+                    earlier = match is not None and group_rank[match.lastgroup] < rank
+                    phrase_index[phrase] = rule_by_intent[match.lastgroup] if earlier else rule
+        return rules, master, rule_by_intent, phrase_index
+
+    def _match_rule(self, normalized: str) -> Optional[RuleDefinition]:
+        """Return the first rule (in rule order) whose phrase or regex matches."""
+        rule = self._phrase_index.get(normalized)
+        if rule is not None:
+            return rule
+        # Cheap substring prefilter: most non-rule text never reaches the fused regex.
+        if not _RULE_KEYWORD_SEARCH(normalized):
+            return None
+        match = self._master_fullmatch(normalized)
+        return self._rule_by_intent[match.lastgroup] if match else None
 
     def detect(self, text: str) -> Optional[IntentResult]:
         normalized = _normalize(text)
-        for rule in self.rules:
-            if rule.matches(normalized):
-                entities = self._extract_for_intent(rule.intent, text)
-                # Default branch handling when the user omitted a branch name.
-                branch_intents = {"create_branch", "switch_branch", "push_branch", "pull_origin", "rebase_branch"}
-                if rule.intent in branch_intents:
-                    missing_branch = not entities.get("branch") or entities.get("branch", "").lower() == "branch"
-                    if missing_branch:
-                        entities["branch"] = config.DEFAULT_BRANCH
-                        reason = f"Branch name not provided; defaulting to '{config.DEFAULT_BRANCH}' unless a name is specified."
-                    else:
-                        reason = rule.reason or f"Rule matched for intent '{rule.intent}'."
-                else:
-                    reason = rule.reason or f"Rule matched for intent '{rule.intent}'."
-
-                return IntentResult(
-                    intent=rule.intent,
-                    confidence=1.0,
-                    source="rule",
-                    entities=entities,
-                    reason=reason,
-                )
-        return None
+        rule = self._match_rule(normalized)
+        if rule is None:
+            return None
+        entities = self._extract_for_intent(rule.intent, text)
+        # Default branch handling when the user omitted a branch name.
+        if rule.intent in _BRANCH_INTENTS:
+            missing_branch = not entities.get("branch") or entities.get("branch", "").lower() == "branch"
+            if missing_branch:
+                default_branch = config.DEFAULT_BRANCH
+                entities["branch"] = default_branch
+                reason = _missing_branch_reason(default_branch)
+            else:
+                reason = rule.match_reason
+        else:
+            reason = rule.match_reason
+
+        return IntentResult(
+            intent=rule.intent,
+            confidence=1.0,
+            source="rule",
+            entities=entities,
+            reason=reason,
+        )
 
     def _extract_for_intent(self, intent: str, text: str) -> Dict[str, str]:
         """Shared extraction, filtered to the entities relevant for the intent."""
@@ -119,11 +216,9 @@ class RuleBasedIntentDetector:
                     "record changes",
                 ],
                 fullmatch_regexes=[
-                    re.compile(r"commit", re.IGNORECASE),
-                    re.compile(r"save changes", re.IGNORECASE),
-                    re.compile(r"record changes", re.IGNORECASE),
-                    # Broader match: any sentence containing commit/save/record (captures message if present).
-                    re.compile(r".*\b(commit|save|record)\b.*", re.IGNORECASE),
+                    # Any sentence containing commit/save/record; this also covers the bare
+                    # "commit" / "save changes" / "record changes" forms.
+                    re.compile(r".*?\b(commit|save|record)\b.*"),
                 ],
                 reason="User asked to create a commit.",
             ),
@@ -152,7 +247,7 @@ class RuleBasedIntentDetector:
                     "send changes",
                 ],
                 fullmatch_regexes=[
-                    re.compile(r"(push|send)\s+(latest\s+)?commit(\s+to\s+(origin|remote))?", re.IGNORECASE)
+                    re.compile(r"(push|send)\s+(latest\s+)?commit(\s+to\s+(origin|remote))?")
                 ],
                 reason="User asked to push commits to the remote origin.",
             ),
@@ -164,12 +259,10 @@ class RuleBasedIntentDetector:
                     "make branch",
                 ],
                 fullmatch_regexes=[
-                    re.compile(r"(create|make|new)\s+branch\s+(?P<branch>[a-z0-9._\-/]+)", re.IGNORECASE),
-                    re.compile(r"(create|make|new)\s+branch", re.IGNORECASE),
-                    # Broader: any sentence asking to create/make a branch, capturing the branch name.
+                    re.compile(r"(create|make|new)\s+branch"),
+                    # Any sentence asking to create/make a named branch (covers "create branch <name>").
                     re.compile(
-                        r".*\b(create|make|new)\s+(?:a\s+)?branch(?:\s+(?:called|named|with\s+name))?\s+(?P<branch>[A-Za-z0-9._\-/]+).*",
-                        re.IGNORECASE,
+                        r".*?\b(create|make|new)\s+(?:a\s+)?branch(?:\s+(?:called|named|with\s+name))?\s+(?P<branch>[A-Za-z0-9._\-/]+).*",
                     ),
                 ],
                 reason="User asked to create a branch.",
@@ -183,11 +276,10 @@ class RuleBasedIntentDetector:
                     "go to branch",
                 ],
                 fullmatch_regexes=[
-                    re.compile(r"(switch|checkout|change|go)\s+(to\s+)?branch\s+(?P<branch>[A-Za-z0-9._\-/]+)", re.IGNORECASE),
-                    re.compile(r"(switch|checkout|change|go)\s+(to\s+)?branch", re.IGNORECASE),
+                    re.compile(r"(switch|checkout|change|go)\s+(to\s+)?branch"),
+                    # Any sentence asking to switch to a named branch (covers "switch to branch <name>").
                     re.compile(
-                        r".*\b(switch|checkout|change|go)\s+(?:to\s+)?(?:the\s+)?branch(?:\s+(?:called|named|with\s+name))?\s+(?P<branch>[A-Za-z0-9._\-/]+).*",
-                        re.IGNORECASE,
+                        r".*?\b(switch|checkout|change|go)\s+(?:to\s+)?(?:the\s+)?branch(?:\s+(?:called|named|with\s+name))?\s+(?P<branch>[A-Za-z0-9._\-/]+).*",
                     ),
                 ],
                 reason="User asked to switch branches.",
@@ -200,10 +292,9 @@ class RuleBasedIntentDetector:
                     "send branch",
                 ],
                 fullmatch_regexes=[
-                    re.compile(r"(push|publish|send)\s+branch\s+(?P<branch>[A-Za-z0-9._\-/]+)", re.IGNORECASE),
+                    # Any sentence asking to push a named branch (covers "push branch <name>").
                     re.compile(
-                        r".*\b(push|publish|send)\s+(?:my\s+)?branch(?:\s+(?:called|named|with\s+name))?\s+(?P<branch>[A-Za-z0-9._\-/]+).*",
-                        re.IGNORECASE,
+                        r".*?\b(push|publish|send)\s+(?:my\s+)?branch(?:\s+(?:called|named|with\s+name))?\s+(?P<branch>[A-Za-z0-9._\-/]+).*",
                     ),
                 ],
                 reason="User asked to push a branch to origin.",
@@ -218,10 +309,8 @@ class RuleBasedIntentDetector:
                     "sync with origin",
                 ],
                 fullmatch_regexes=[
-                    re.compile(r"(git\s+)?pull(\s+origin(\s+(?P<branch>[A-Za-z0-9._\-/]+))?)?", re.IGNORECASE),
-                    re.compile(
-                        r"(pull|sync|update)\s+(from\s+)?origin(\s+(?P<branch>[A-Za-z0-9._\-/]+))?", re.IGNORECASE
-                    ),
+                    re.compile(r"(git\s+)?pull(\s+origin(\s+(?P<branch>[A-Za-z0-9._\-/]+))?)?"),
+                    re.compile(r"(pull|sync|update)\s+(from\s+)?origin(\s+(?P<branch>[A-Za-z0-9._\-/]+))?"),
                 ],
                 reason="User asked to pull the latest changes from origin.",
             ),
@@ -235,9 +324,9 @@ class RuleBasedIntentDetector:
                     "stash current work",
                 ],
                 fullmatch_regexes=[
-                    re.compile(r"(git\s+)?stash(\s+push)?", re.IGNORECASE),
-                    re.compile(r"(stash|save)\s+(my\s+)?changes", re.IGNORECASE),
-                    re.compile(r"stash\s+(current\s+)?work", re.IGNORECASE),
+                    re.compile(r"(git\s+)?stash(\s+push)?"),
+                    re.compile(r"(stash|save)\s+(my\s+)?changes"),
+                    re.compile(r"stash\s+(current\s+)?work"),
                 ],
                 reason="User asked to stash their uncommitted changes.",
             ),
@@ -250,10 +339,8 @@ class RuleBasedIntentDetector:
                     "rebase with main",
                 ],
                 fullmatch_regexes=[
-                    re.compile(
-                        r"rebase\s+(?:onto|on|with|against)\s+(?P<branch>[A-Za-z0-9._\-/]+)", re.IGNORECASE
-                    ),
-                    re.compile(r"rebase(\s+branch)?(\s+(?P<branch>[A-Za-z0-9._\-/]+))?", re.IGNORECASE),
+                    re.compile(r"rebase\s+(?:onto|on|with|against)\s+(?P<branch>[A-Za-z0-9._\-/]+)"),
+                    re.compile(r"rebase(\s+branch)?(\s+(?P<branch>[A-Za-z0-9._\-/]+))?"),
                 ],
                 reason="User asked to rebase the current branch onto another branch.",
             ),
@@ -268,12 +355,8 @@ class RuleBasedIntentDetector:
                 fullmatch_regexes=[
                     re.compile(
                         r"(soft\s+reset|reset\s+(?:--)?soft)(\s+to\s+(?P<target>[A-Za-z0-9._\-/~^]+))?",
-                        re.IGNORECASE,
-                    ),
-                    re.compile(
-                        r"(undo|revert)\s+last\s+commit(\s+soft(ly)?)?",
-                        re.IGNORECASE,
                     ),
+                    re.compile(r"(undo|revert)\s+last\s+commit(\s+soft(ly)?)?"),
                 ],
                 reason="User asked to soft reset to a previous commit while keeping changes staged.",
             ),
@@ -288,9 +371,8 @@ class RuleBasedIntentDetector:
                 fullmatch_regexes=[
                     re.compile(
                         r"(hard\s+reset|reset\s+(?:--)?hard)(\s+to\s+(?P<target>[A-Za-z0-9._\-/~^]+))?",
-                        re.IGNORECASE,
                     ),
-                    re.compile(r"(discard|drop)\s+changes", re.IGNORECASE),
+                    re.compile(r"(discard|drop)\s+changes"),
                 ],
                 reason="User asked to hard reset and discard local changes.",
             ),
@@ -3,64 +3,97 @@
 from __future__ import annotations
 
 import math
+import re
 from dataclasses import dataclass
-from typing import Dict, List, Sequence, Tuple
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 from git_nl import config
 from .types import IntentResult
 
 
+_CONTRACTIONS = {
+    "i've": "i have",
+    "ive": "i have",
+    "can't": "cannot",
+    "don't": "do not",
+}
+_CONTRACTIONS_PATTERN = re.compile(r"\b(" + "|".join(re.escape(k) for k in _CONTRACTIONS) + r")\b")
+# Runs of whitespace and disallowed characters collapse to one space in a single pass.
+_SEPARATOR_PATTERN = re.compile(r"[^a-z0-9\-/\.]+")
+
+
+@lru_cache(maxsize=2048)
 def _normalize(text: str) -> str:
     """Lowercase, strip punctuation, collapse whitespace for deterministic matching."""
-    import re
+    lowered = _CONTRACTIONS_PATTERN.sub(lambda m: _CONTRACTIONS[m.group(1)], text.lower())
+    return _SEPARATOR_PATTERN.sub(" ", lowered).strip()
 
-    CONTRACTIONS = {
-        "i've": "i have",
-        "ive": "i have",
-        "can't": "cannot",
-        "don't": "do not",
-    }
 
-    lowered = text.lower()
-    for k, v in CONTRACTIONS.items():
-        lowered = re.sub(rf"\b{k}\b", v, lowered)
-
-    cleaned = re.sub(r"[^a-z0-9\s\-/\.]", " ", lowered)
-    return re.sub(r"\s+", " ", cleaned).strip()
+# Commit message clauses are dropped entirely before embedding.
+_MESSAGE_CLAUSE_PATTERN = re.compile(
+    r"\b(with\s+(the\s+)?)?message\s+['\"]?[^'\"]+['\"]?", re.IGNORECASE
+)
+# Branch-name mentions collapse to "<verb> branch" so entity strings don't sway similarity.
+# Each pattern is keyed by a literal it cannot match without, so absent keywords skip it.
+_BRANCH_MENTION_PATTERNS = tuple(
+    (keyword, re.compile(pattern, re.IGNORECASE))
+    for keyword, pattern in (
+        ("branch", r"\b(create|make|new)\s+(?:a\s+)?branch\s+(called|named)?\s*[A-Za-z0-9._\-/]+"),
+        ("branch", r"\b(switch|checkout|change|go)\s+(to\s+)?(?:the\s+)?branch\s+[A-Za-z0-9._\-/]+"),
+        ("branch", r"\b(push|publish|send)\s+(?:my\s+)?branch\s+[A-Za-z0-9._\-/]+"),
+        ("origin", r"\b(pull|sync|update)\s+(?:from\s+)?origin\s+[A-Za-z0-9._\-/]+"),
+        ("rebase", r"\b(rebase)\b.*\b(?:onto|on|with|against)\s+[A-Za-z0-9._\-/]+"),
+    )
+)
+# One pass finds which of those keywords occur (same case-insensitivity as the patterns).
+_ENTITY_KEYWORDS = re.compile(
+    "|".join(f"(?P<{k}>{k})" for k in ("message", "branch", "origin", "rebase")), re.IGNORECASE
+)
 
 
 def _strip_entities(text: str) -> str:
     """Remove or neutralize user-supplied entity fragments (message, branch names)."""
-    import re
-
-    # Remove commit message clauses.
-    text = re.sub(r"\b(with\s+(the\s+)?)?message\s+['\"]?[^'\"]+['\"]?", " ", text, flags=re.IGNORECASE)
-
-    # Normalize branch-name mentions to a generic token so entity strings don't sway similarity.
-    branch_patterns = [
-        r"\b(create|make|new)\s+(?:a\s+)?branch\s+(called|named)?\s*[A-Za-z0-9._\-/]+",
-        r"\b(switch|checkout|change|go)\s+(to\s+)?(?:the\s+)?branch\s+[A-Za-z0-9._\-/]+",
-        r"\b(push|publish|send)\s+(?:my\s+)?branch\s+[A-Za-z0-9._\-/]+",
-        r"\b(pull|sync|update)\s+(?:from\s+)?origin\s+[A-Za-z0-9._\-/]+",
-        r"\b(rebase)\b.*\b(?:onto|on|with|against)\s+[A-Za-z0-9._\-/]+",
-    ]
-    for pat in branch_patterns:
-        text = re.sub(pat, r"\1 branch", text, flags=re.IGNORECASE)
-
+    keywords = {m.lastgroup for m in _ENTITY_KEYWORDS.finditer(text)}
+    if not keywords:
+        return text
+    if "message" in keywords:
+        text = _MESSAGE_CLAUSE_PATTERN.sub(" ", text)
+    for keyword, pattern in _BRANCH_MENTION_PATTERNS:
+        if keyword in keywords:
+            text = pattern.sub(r"\1 branch", text)
     return text
 
 
+@lru_cache(maxsize=2048)
+def _preprocess(text: str) -> str:
+    """Entity-stripped, normalized form of a query; the text that gets embedded."""
+    return _normalize(_strip_entities(text))
+
+
 def _tokenize(text: str) -> List[str]:
     return _normalize(text).split()
 
 
-def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(y * y for y in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+def term_vector(text: str) -> Dict[str, float]:
+    """L2-normalized term counts over every token of `text` (not just the catalog vocabulary)."""
+    counts: Dict[str, float] = {}
+    for token in _preprocess(text).split():
+        counts[token] = counts.get(token, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in counts.values()))
+    if norm == 0:
+        return {}
+    return {token: v / norm for token, v in counts.items()}
+
+
+# Dot products of unit vectors can land an ulp or so below a threshold they meet exactly
+# (e.g. 0.7999999999999999 against 0.80), so threshold checks allow this much slack.
+_SCORE_TOLERANCE = 1e-9
+
+
+def meets_threshold(score: float, threshold: float) -> bool:
+    """True when a similarity clears `threshold`, allowing for float rounding."""
+    return score >= threshold - _SCORE_TOLERANCE
 
 
 def _l2_normalize(vector: List[float]) -> List[float]:
@@ -182,7 +215,7 @@ class SemanticExample:
     embedding: List[float]
 
 
-@dataclass
+@dataclass(frozen=True)
 class SemanticMatch:
     intent: str
     text: str
@@ -236,25 +269,74 @@ class SemanticIntentDetector:
         else:
             self.vocab = _build_vocab(self.catalog)
             self.examples = _build_examples(self.catalog, self.vocab)
+        self._vocab_index: Dict[str, int] = {term: i for i, term in enumerate(self.vocab)}
+        # Parallel per-example columns (intent, text), so the hot loop never goes through
+        # SemanticExample attributes.
+        self._intents: List[str] = [example.intent for example in self.examples]
+        self._texts: List[str] = [example.text for example in self.examples]
+        # Inverted index (vocab index -> (example index, weight) in example order): scoring
+        # only visits examples that share a term with the query. The rest score 0 and can
+        # never beat one that does, since every query term comes from some example.
+        # Embeddings are stored unit-length (see `_embed`), so cosine similarity is the raw dot.
+        self._postings: Dict[int, List[Tuple[int, float]]] = {}
+        for index, example in enumerate(self.examples):
+            norm_sq = sum(w * w for w in example.embedding)
+            assert norm_sq == 0 or abs(norm_sq - 1.0) < _SCORE_TOLERANCE, (
+                f"semantic example {example.text!r} is not unit-length"
+            )
+            for i, w in enumerate(example.embedding):
+                if w:
+                    self._postings.setdefault(i, []).append((index, w))
+        # Per-instance memos: repeated clauses share one set of similarities, and phrasings that
+        # normalize to the same text share one query vector. Thresholds are not part of either,
+        # so winners are always picked against the current config.
+        self._similarities = lru_cache(maxsize=256)(self._similarities)
+        self._embed_query = lru_cache(maxsize=512)(self._embed_query)
 
     def score(self, text: str) -> SemanticMatch | None:
-        """Return the best catalog match regardless of threshold."""
-        normalized = _normalize(_strip_entities(text))
-        query_vec = self._embed(normalized, self.vocab)
-        if not any(query_vec):
+        """Return the best catalog match.
+
+        That is the highest-scoring example that clears its intent's threshold, or, when none
+        does, the highest-scoring example overall (so callers can still report it).
+        """
+        similarities = self._similarities(text)
+        if not similarities:
             return None
 
-        best_example: SemanticExample | None = None
+        # Thresholds are read at match time, like the router's accept/reject check.
+        by_intent = config.SEMANTIC_CONFIDENCE_BY_INTENT
+        default_threshold = config.SEMANTIC_CONFIDENCE_THRESHOLD
+        intents = self._intents
+        best_index = -1
         best_score = -1.0
-        for example in self.examples:
-            score = _cosine_similarity(query_vec, example.embedding)
+        passing_index = -1
+        passing_score = -1.0
+        for index, score in similarities:
             if score > best_score:
-                best_example = example
+                best_index = index
                 best_score = score
-
-        if best_example is None:
-            return None
-        return SemanticMatch(intent=best_example.intent, text=best_example.text, score=best_score)
+            if score > passing_score and meets_threshold(
+                score, by_intent.get(intents[index], default_threshold)
+            ):
+                passing_index = index
+                passing_score = score
+
+        # A lower-scoring example of a more lenient intent beats a top match that misses its bar.
+        if passing_index >= 0:
+            best_index, best_score = passing_index, passing_score
+        return SemanticMatch(intent=intents[best_index], text=self._texts[best_index], score=best_score)
+
+    def _similarities(self, text: str) -> Tuple[Tuple[int, float], ...]:
+        """(example index, cosine similarity) for every example sharing a term with `text`, by index."""
+        query_terms = self._embed_query(_preprocess(text))
+        # Both sides are unit-length, so the dot product is the cosine similarity. Sums run per
+        # query term in vocabulary order, matching the dense dot product exactly.
+        dots: Dict[int, float] = {}
+        postings = self._postings
+        for i, x in query_terms:
+            for index, w in postings.get(i, ()):
+                dots[index] = dots.get(index, 0.0) + x * w
+        return tuple(sorted(dots.items()))
 
     def detect(self, text: str) -> IntentResult | None:
         match = self.score(text)
@@ -264,7 +346,7 @@ class SemanticIntentDetector:
         threshold = config.SEMANTIC_CONFIDENCE_BY_INTENT.get(
             match.intent, config.SEMANTIC_CONFIDENCE_THRESHOLD
         )
-        if match.score < threshold:
+        if not meets_threshold(match.score, threshold):
             return None
 
         return IntentResult(
@@ -278,8 +360,19 @@ class SemanticIntentDetector:
             ),
         )
 
-    def _embed(self, text: str, vocab: List[str]) -> List[float]:
-        return _embed(text, vocab)
+    def _embed_query(self, text: str) -> Tuple[Tuple[int, float], ...]:
+        """L2-normalized (vocab index, weight) pairs for the catalog terms in `text`, by index."""
+        vocab_index = self._vocab_index
+        counts: Dict[int, float] = {}
+        for token in _tokenize(text):
+            i = vocab_index.get(token)
+            if i is not None:
+                counts[i] = counts.get(i, 0.0) + 1.0
+        if not counts:
+            return ()
+        terms = sorted(counts.items())
+        norm = math.sqrt(sum(c * c for _, c in terms))
+        return tuple((i, c / norm) for i, c in terms)
 
 
 # Shared detector so callers don’t rebuild per instance.
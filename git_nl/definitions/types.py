@@ -1,8 +1,12 @@
+import sys
 from dataclasses import dataclass, field
 from typing import Dict
 
+# Spread into @dataclass(...) for small hot records; `slots=` needs Python 3.10+.
+DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class IntentResult:
     """Unified intent output used across routing strategies."""
 
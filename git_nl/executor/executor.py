@@ -2,11 +2,12 @@
 
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List
+from typing import List, Sequence
 
 from git_nl import config
-from git_nl.planner import Plan
+from git_nl.planner import Plan, PlanStep
 
 
 @dataclass
@@ -27,19 +28,48 @@ class Executor:
     def run_plan(self, plan: Plan) -> List[CommandResult]:
         results: List[CommandResult] = []
         for step in plan.steps:
-            results.append(self._run_command(step.command))
+            results.append(self._run_command(step.command, step.argv))
             if results[-1].returncode != 0:
                 break
         return results
 
-    def _run_command(self, command: str) -> CommandResult:
+    def run_independent(self, steps: Sequence[PlanStep]) -> List[CommandResult]:
+        """Run read-only steps concurrently; results keep step order and end at the first error.
+
+        Verification commands don't depend on each other, so their latency is the slowest one
+        (often a networked `git ls-remote`) rather than the sum.
+        """
+        if self.dry_run or len(steps) < 2:
+            results: List[CommandResult] = []
+            for step in steps:
+                results.append(self._run_command(step.command, step.argv))
+                if results[-1].returncode != 0:
+                    break
+            return results
+
+        with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+            results = list(pool.map(lambda step: self._run_command(step.command, step.argv), steps))
+        for idx, result in enumerate(results):
+            if result.returncode != 0:
+                return results[: idx + 1]
+        return results
+
+    def _run_command(self, command: str, argv: Sequence[str] = ()) -> CommandResult:
         started_at = time.perf_counter()
 
         if self.dry_run:
             latency_sec = time.perf_counter() - started_at
             return CommandResult(command=command, returncode=0, stdout="(dry-run)", stderr="", latency_sec=latency_sec)
 
-        completed = subprocess.run(command, shell=True, capture_output=True, text=True)
+        try:
+            if argv:
+                # Templated git invocations need no shell: one fewer process, no expansion of entities.
+                completed = subprocess.run(list(argv), capture_output=True, text=True)
+            else:
+                completed = subprocess.run(command, shell=True, capture_output=True, text=True)
+        except OSError as exc:  # e.g. git missing from PATH; mirror the shell's "not found" status
+            latency_sec = time.perf_counter() - started_at
+            return CommandResult(command=command, returncode=127, stdout="", stderr=str(exc), latency_sec=latency_sec)
         latency_sec = time.perf_counter() - started_at
         return CommandResult(
             command=command,
@@ -1,59 +1,121 @@
 """Defines the plan for each intent, includes steps and verification commands. rename to rule_plans.py"""
 
-from dataclasses import dataclass, field
-from typing import Dict, List
+import shlex
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Mapping, Optional, Sequence, Tuple
 
 from git_nl import config
-from git_nl.definitions.types import IntentResult
+from git_nl.definitions.types import DATACLASS_SLOTS, IntentResult
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class PlanStep:
     command: str
     description: str = ""
+    # Pre-split arguments run without a shell; empty means `command` goes through the shell.
+    argv: Tuple[str, ...] = ()
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class Plan:
     intent: str
-    steps: List[PlanStep] = field(default_factory=list)
-    verification: List[PlanStep] = field(default_factory=list)
+    steps: Sequence[PlanStep] = ()
+    verification: Sequence[PlanStep] = ()
+
+    def __post_init__(self) -> None:
+        # Plans are shared templates and cached renders, so steps are fixed tuples.
+        object.__setattr__(self, "steps", tuple(self.steps))
+        object.__setattr__(self, "verification", tuple(self.verification))
+
+
+# (literal, placeholder name or None) pairs, as produced by string.Formatter().parse.
+_Segments = Tuple[Tuple[str, Optional[str]], ...]
+_FORMATTER = string.Formatter()
+
+
+def _parse_segments(template: str) -> _Segments:
+    return tuple((literal, field) for literal, field, _, _ in _FORMATTER.parse(template))
+
+
+@lru_cache(maxsize=None)
+def _compile_template(command: str) -> Tuple[_Segments, Tuple[_Segments, ...]]:
+    """Parse a step template once: segments for the command and for each shell-split token.
+
+    Tokens come from splitting the template, not the filled string, so entity values stay
+    single arguments whatever they contain.
+    """
+    return _parse_segments(command), tuple(_parse_segments(part) for part in shlex.split(command))
+
+
+@lru_cache(maxsize=None)
+def _static_step(command: str, description: str) -> PlanStep:
+    """A placeholder-free step renders to itself, so every plan can share one frozen copy."""
+    return PlanStep(command=command, description=description, argv=tuple(shlex.split(command)))
+
+
+def _render(segments: _Segments, values: Mapping[str, str]) -> str:
+    return "".join(literal + values[field] if field is not None else literal for literal, field in segments)
+
+
+# intent -> plan template, shared per planner class. Defaults read config, so they are not kept here.
+_PLAN_TABLES: Dict[type, Dict[str, Plan]] = {}
 
 
 class Planner:
     """Maps intents to predefined workflows."""
 
     def __init__(self) -> None:
-        self.intent_plans = self._build_plans()
-        self.intent_defaults = self._build_defaults()
+        # Templates are never mutated, so build them once per planner class and share them.
+        plans = _PLAN_TABLES.get(type(self))
+        if plans is None:
+            plans = _PLAN_TABLES[type(self)] = self._build_plans()
+        self.intent_plans = plans
+        # Rendering depends only on the intent, its entities and config defaults (read when a
+        # plan is first rendered), so repeated requests share one Plan; call
+        # `_render_plan.cache_clear()` after changing config defaults.
+        self._render_plan = lru_cache(maxsize=256)(self._render_plan)
+
+    @property
+    def intent_defaults(self) -> Dict[str, Dict[str, str]]:
+        """Per-intent entity defaults, built from the current config on each access."""
+        return self._build_defaults()
 
     def build_plan(self, intent_result: IntentResult) -> Plan:
         if intent_result.intent not in self.intent_plans:
             raise ValueError(f"No plan defined for intent '{intent_result.intent}'.")
+        entities = intent_result.entities or {}
+        return self._render_plan(intent_result.intent, tuple(sorted(entities.items())))
+
+    def _render_plan(self, intent: str, entity_items: Tuple[Tuple[str, str], ...]) -> Plan:
+        template = self.intent_plans[intent]
+        # Placeholder values are the same for every step, so resolve them once per plan.
+        values = self._resolve_values(dict(entity_items), self._build_defaults().get(intent, {}))
+        steps = tuple(self._fill(step.command, step.description, values) for step in template.steps)
+        verification = tuple(self._fill(step.command, step.description, values) for step in template.verification)
+        return Plan(intent=intent, steps=steps, verification=verification)
+
+    def _resolve_values(self, entities: Dict[str, str], defaults: Dict[str, str]) -> Dict[str, str]:
+        """Entities over per-intent defaults, with config fallbacks for blank placeholders."""
+        values = {**defaults, **entities}
+        if not values.get("message", "").strip():
+            values["message"] = config.DEFAULT_COMMIT_MESSAGE
+        if not values.get("branch", "").strip():
+            values["branch"] = config.DEFAULT_BRANCH
+        if not values.get("target", "").strip():
+            values["target"] = defaults.get("target") or config.DEFAULT_RESET_TARGET
+        return values
 
-        template = self.intent_plans[intent_result.intent]
-        defaults = self.intent_defaults.get(intent_result.intent, {})
-        steps = [self._fill(step.command, intent_result.entities, step.description, defaults) for step in template.steps]
-        verification = [
-            self._fill(step.command, intent_result.entities, step.description, defaults)
-            for step in template.verification
-        ]
-        return Plan(intent=intent_result.intent, steps=steps, verification=verification)
-
-    def _fill(self, command: str, entities: Dict[str, str], description: str, defaults: Dict[str, str]) -> PlanStep:
-        enriched = dict(defaults or {})
-        enriched.update(entities or {})
-        msg = enriched.get("message", "").strip()
-        if not msg:
-            enriched["message"] = config.DEFAULT_COMMIT_MESSAGE
-        branch = enriched.get("branch", "").strip()
-        if not branch:
-            enriched["branch"] = config.DEFAULT_BRANCH
-        target = enriched.get("target", "").strip()
-        if not target:
-            enriched["target"] = (defaults or {}).get("target") or config.DEFAULT_RESET_TARGET
-        filled = command.format(**enriched) if enriched else command
-        return PlanStep(command=filled, description=description)
+    def _fill(self, command: str, description: str, values: Mapping[str, str]) -> PlanStep:
+        if "{" not in command:
+            return _static_step(command, description)
+        segments, argv_segments = _compile_template(command)
+        return PlanStep(
+            command=_render(segments, values),
+            description=description,
+            argv=tuple(_render(part, values) for part in argv_segments),
+        )
 
     def _build_plans(self) -> Dict[str, Plan]:
         return {
@@ -13,10 +13,5 @@ class Verifier:
         self.executor = executor
 
     def verify(self, plan: Plan) -> List[CommandResult]:
-        results: List[CommandResult] = []
-        for step in plan.verification:
-            results.append(self.executor._run_command(step.command))  # reuse executor behavior
-            if results[-1].returncode != 0:
-                break
-        return results
+        return self.executor.run_independent(plan.verification)  # reuse executor behavior
 
@@ -9,6 +9,12 @@ class EntityExtractorTests(unittest.TestCase):
         entities = extract_entities(text)
         self.assertEqual(entities.get("message"), "fix login bug")
 
+    def test_commit_message_from_inline_quoted_flag(self) -> None:
+        text = 'commit --message="fix login bug" -b feature/auth'
+        entities = extract_entities(text)
+        self.assertEqual(entities.get("message"), "fix login bug")
+        self.assertEqual(entities.get("branch"), "feature/auth")
+
     def test_branch_from_create_phrase(self) -> None:
         text = "please create branch feature/auth-rework"
         entities = extract_entities(text)
@@ -71,6 +77,30 @@ class EntityExtractorTests(unittest.TestCase):
         entities = extract_entities(text)
         self.assertEqual(entities.get("target"), "HEAD~1")
 
+    def test_rejected_target_does_not_hide_other_patterns(self) -> None:
+        # Both reset patterns match at "reset"; the first yields a stopword, the second "to".
+        self.assertEqual(extract_entities("reset to work").get("target"), "to")
+
+    def test_non_ascii_case_folds_are_not_captured_as_refs(self) -> None:
+        # U+212A KELVIN SIGN and U+017F LONG S fold to ASCII letters under IGNORECASE.
+        entities = extract_entities("switch to branch \u212aelvin")
+        self.assertEqual(entities.get("branch"), "to")
+        entities = extract_entities("reset to HEAD\u017f")
+        self.assertEqual(entities.get("target"), "to")
+        self.assertNotIn("branch", extract_entities("branch HEAD\u017f"))
+
+    def test_keyword_prefilter_keeps_ignorecase_only_folds(self) -> None:
+        # U+0130 matches `i` under IGNORECASE but casefolds to "i" + U+0307.
+        self.assertEqual(extract_entities("sync from or\u0130gin dev").get("branch"), "dev")
+        self.assertEqual(extract_entities("sw\u0130tch dev").get("branch"), "dev")
+
+    def test_results_are_cached_and_read_only(self) -> None:
+        text = "switch to branch feature/cache"
+        first = extract_entities(text)
+        self.assertIs(extract_entities(text), first)
+        with self.assertRaises(TypeError):
+            first["branch"] = "other"  # type: ignore[index]
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,42 @@
+import time
+import unittest
+from unittest import mock
+
+from git_nl.executor import CommandResult, Executor
+from git_nl.planner import PlanStep
+
+
+class ExecutorCommandTests(unittest.TestCase):
+    def test_missing_binary_returns_127(self) -> None:
+        result = Executor(dry_run=False)._run_command(
+            "git-nl-missing-binary --version", ("git-nl-missing-binary", "--version")
+        )
+        self.assertEqual(result.returncode, 127)
+        self.assertEqual(result.stdout, "")
+        self.assertTrue(result.stderr)
+
+
+class ExecutorIndependentTests(unittest.TestCase):
+    def test_results_keep_step_order_and_stop_at_first_failure(self) -> None:
+        # Earlier steps finish last, and the middle one fails.
+        latencies = {"first": 0.15, "second": 0.1, "third": 0.05, "fourth": 0.0}
+        finished = []
+
+        def fake_run(command, argv=()):
+            time.sleep(latencies[command])
+            finished.append(command)
+            returncode = 1 if command == "second" else 0
+            return CommandResult(command=command, returncode=returncode, stdout="", stderr="", latency_sec=0.0)
+
+        executor = Executor(dry_run=False)
+        steps = [PlanStep(command=name) for name in latencies]
+        with mock.patch.object(executor, "_run_command", side_effect=fake_run):
+            results = executor.run_independent(steps)
+        self.assertEqual([r.command for r in results], ["first", "second"])
+        self.assertEqual(results[-1].returncode, 1)
+        # The steps really ran concurrently: completion order differs from step order.
+        self.assertEqual(finished[0], "fourth")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+
+from git_nl import config
+from git_nl.definitions import llm
+from git_nl.definitions.llm import LLMIntentDetector
+
+ALLOWED = ["push_branch", "stash_changes"]
+
+
+class CountingLLMDetector(LLMIntentDetector):
+    def __init__(self, intent: str) -> None:
+        super().__init__(api_key="test-key", api_base="https://llm.invalid/api")
+        self.intent = intent
+        self.calls = 0
+
+    def _call_llm(self, data):
+        self.calls += 1
+        return {"intent": self.intent, "confidence": 0.9}, None
+
+
+class LLMSemanticCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        llm._SEMANTIC_CACHE._entries.clear()
+
+    def test_near_duplicate_reuses_classification(self) -> None:
+        detector = CountingLLMDetector("stash_changes")
+        first, _ = detector.detect("please tuck away all of my current edits for later", ALLOWED)
+        second, reason = detector.detect("please tuck away all of my current edits for later now", ALLOWED)
+        self.assertEqual(detector.calls, 1)
+        self.assertEqual(second.intent, first.intent)
+        self.assertIn("semantic cache", reason)
+
+    def test_negated_near_duplicate_calls_llm(self) -> None:
+        detector = CountingLLMDetector("undo_commit_soft")
+        detector.detect("undo the last commit but keep all the changes", ["undo_commit_soft"])
+        detector.detect("undo the last commit but don't keep all the changes", ["undo_commit_soft"])
+        self.assertEqual(detector.calls, 2)
+
+    def test_opposite_polarity_near_duplicate_calls_llm(self) -> None:
+        detector = CountingLLMDetector("reset_hard")
+        allowed = ["reset_hard", "reset_soft"]
+        detector.detect("throw away every local edit in my working copy and go back to the last commit", allowed)
+        detector.detect("keep every local edit in my working copy and go back to the last commit", allowed)
+        self.assertEqual(detector.calls, 2)
+
+    def test_dissimilar_text_calls_llm(self) -> None:
+        detector = CountingLLMDetector("stash_changes")
+        detector.detect("tuck away my edits", ALLOWED)
+        detector.detect("ship the feature branch upstream", ALLOWED)
+        self.assertEqual(detector.calls, 2)
+
+
+class BatchFallbackLLMDetector(LLMIntentDetector):
+    """Fails the batched request with `batch_error`, then answers each clause on its own."""
+
+    ANSWERS = {"stash my edits": "stash_changes", "publish my branch": "push_branch"}
+
+    def __init__(self, batch_error: str) -> None:
+        super().__init__(api_key="test-key", api_base="https://llm.invalid/api")
+        self.batch_error = batch_error
+        self.calls = 0
+        self._calls_lock = threading.Lock()
+
+    def _call_llm(self, data):
+        with self._calls_lock:
+            self.calls += 1
+        if llm._SYSTEM_MESSAGE_MULTI in data:
+            return None, self.batch_error
+        for clause, intent in self.ANSWERS.items():
+            if clause.encode() in data:
+                return {"intent": intent, "confidence": 0.9}, None
+        return {"intent": "unknown", "confidence": 0.0}, None
+
+
+class LLMBatchFallbackTests(unittest.TestCase):
+    CLAUSES = ["stash my edits", "publish my branch"]
+
+    def setUp(self) -> None:
+        llm._SEMANTIC_CACHE._entries.clear()
+
+    def test_unparseable_batch_falls_back_per_clause(self) -> None:
+        detector = BatchFallbackLLMDetector(f"{llm._PARSE_FAILED}: Expecting value")
+        results, reason = detector.detect_many(self.CLAUSES, ALLOWED)
+        self.assertEqual([(r.clause_index, r.intent) for r in results], [(0, "stash_changes"), (1, "push_branch")])
+        self.assertEqual(detector.calls, 3)
+        self.assertIn("per clause", reason)
+
+    def test_transport_errors_do_not_fan_out(self) -> None:
+        for error in ("LLM network error: timed out", "LLM HTTP error 503: Service Unavailable"):
+            with self.subTest(error=error):
+                detector = BatchFallbackLLMDetector(error)
+                results, reason = detector.detect_many(self.CLAUSES, ALLOWED)
+                self.assertIsNone(results)
+                self.assertEqual(reason, error)
+                self.assertEqual(detector.calls, 1)
+
+
+class LLMRetryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        llm._RESPONSE_CACHE.clear()
+
+    def test_connection_error_is_retried(self) -> None:
+        body = json.dumps({"choices": [{"message": {"content": json.dumps({"intent": "stash_changes"})}}]}).encode()
+        responses = [ConnectionRefusedError("refused"), (200, "OK", body)]
+
+        def fake_post(**_kwargs):
+            outcome = responses.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        detector = LLMIntentDetector(api_key="test-key", api_base="https://llm.invalid/api")
+        with mock.patch.object(llm, "_post", side_effect=fake_post), mock.patch.object(config, "LLM_RETRY_BACKOFF", 0):
+            structured, error = detector._call_llm(b"{}")
+        self.assertIsNone(error)
+        self.assertEqual(structured["intent"], "stash_changes")
+        self.assertEqual(responses, [])
+
+    def test_timeout_is_not_retried(self) -> None:
+        detector = LLMIntentDetector(api_key="test-key", api_base="https://llm.invalid/api")
+        with mock.patch.object(llm, "_post", side_effect=TimeoutError("timed out")) as post:
+            structured, error = detector._call_llm(b"{}")
+        self.assertIsNone(structured)
+        self.assertTrue(error.startswith("LLM network error"))
+        self.assertEqual(post.call_count, 1)
+
+
+class LLMTimeoutTests(unittest.TestCase):
+    def test_adaptive_timeout_follows_p95_latency(self) -> None:
+        detector = LLMIntentDetector(api_key="test-key", timeout=6.0)
+        self.assertEqual(detector._request_timeout(), 6.0)
+        for _ in range(10):
+            detector._record_latency(4.0)
+        self.assertEqual(detector._request_timeout(), 8.0)
+
+    def test_adaptive_timeout_is_clamped(self) -> None:
+        detector = LLMIntentDetector(api_key="test-key", timeout=6.0)
+        for _ in range(10):
+            detector._record_latency(60.0)
+        with mock.patch.object(config, "LLM_MAX_TIMEOUT", 20.0):
+            self.assertEqual(detector._request_timeout(), 20.0)
+        # The configured base timeout is never cut by the ceiling.
+        with mock.patch.object(config, "LLM_MAX_TIMEOUT", 3.0):
+            self.assertEqual(detector._request_timeout(), 6.0)
+
+
+class _RedirectingHandler(BaseHTTPRequestHandler):
+    """POSTs to the API path redirect (302) to a path that answers GET with a reply."""
+
+    reply = json.dumps({"choices": [{"message": {"content": json.dumps({"intent": "stash_changes"})}}]}).encode()
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(302)
+        self.send_header("Location", "/moved")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.reply)))
+        self.end_headers()
+        self.wfile.write(self.reply)
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+class LLMHTTPStatusTests(unittest.TestCase):
+    def setUp(self) -> None:
+        llm._RESPONSE_CACHE.clear()
+
+    def test_non_2xx_status_is_an_http_error(self) -> None:
+        detector = LLMIntentDetector(api_key="test-key", api_base="https://llm.invalid/api")
+        with mock.patch.object(llm, "_post", return_value=(304, "Not Modified", b"")) as post:
+            clauses, reason = detector.detect_many(["stash my edits", "push branch"], ALLOWED)
+        self.assertIsNone(clauses)
+        self.assertEqual(reason, "LLM HTTP error 304: Not Modified")
+        # An HTTP error is not a parse failure, so no per-clause fan-out.
+        self.assertEqual(post.call_count, 1)
+
+    def test_pooled_post_follows_redirects(self) -> None:
+        server = HTTPServer(("127.0.0.1", 0), _RedirectingHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        detector = LLMIntentDetector(api_key="test-key", api_base=f"http://127.0.0.1:{server.server_port}/api")
+        with mock.patch.object(llm.urllib.request, "getproxies", return_value={}):
+            structured, error = detector._call_llm(b"{}")
+        self.assertIsNone(error)
+        self.assertEqual(structured["intent"], "stash_changes")
+
+
+if __name__ == "__main__":
+    unittest.main()
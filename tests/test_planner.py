@@ -0,0 +1,28 @@
+import unittest
+
+from git_nl.definitions.types import IntentResult
+from git_nl.planner import Planner
+from git_nl.planner.rule_plans import _compile_template
+
+
+class PlannerArgvTests(unittest.TestCase):
+    def test_compile_template_splits_template_not_values(self) -> None:
+        segments, argv_segments = _compile_template('git commit -m "{message}"')
+        self.assertEqual(segments, (("git commit -m \"", "message"), ('"', None)))
+        self.assertEqual(
+            argv_segments,
+            ((("git", None),), (("commit", None),), (("-m", None),), (("", "message"),)),
+        )
+
+    def test_message_renders_to_one_argv_element(self) -> None:
+        planner = Planner()
+        for message in ('say "hi"', "it's done", "$(rm -rf ~)", "fix; echo pwned", "two  spaced words"):
+            with self.subTest(message=message):
+                plan = planner.build_plan(
+                    IntentResult(intent="commit_changes", confidence=1.0, source="rule", entities={"message": message})
+                )
+                self.assertEqual(plan.steps[-1].argv, ("git", "commit", "-m", message))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -34,6 +34,15 @@ class ConfigurableLLMDetector:
         return results, "stub"
 
 
+class RecordingLLMDetector:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def detect_many(self, clauses, allowed_intents):
+        self.calls.append(list(clauses))
+        return [LLMClauseIntent(clause_index=0, intent="stash_changes", confidence=0.9, reason="stub")], "stub"
+
+
 class RouterMultiIntentTests(unittest.TestCase):
     def test_split_clauses_respects_quotes(self) -> None:
         text = "commit with message 'fix and test' and push commit"
@@ -260,6 +269,18 @@ class RouterMultiIntentTests(unittest.TestCase):
         self.assertEqual(results[0].entities.get("branch"), "feature/foo")
         self.assertEqual(results[1].entities.get("branch"), "feature/foo")
 
+    def test_route_many_llm_batches_only_unresolved_clauses(self) -> None:
+        stub = RecordingLLMDetector()
+        router = IntentRouter(llm_detector=stub)
+        rule_detect = router.rule_detector.detect
+        router.rule_detector.detect = lambda text: rule_detect(text) if text.startswith("create") else None
+
+        results = router.route_many("create branch feature/foo and tuck my edits away")
+
+        self.assertEqual(stub.calls, [["tuck my edits away"]])
+        self.assertEqual([r.intent for r in results], ["create_branch", "stash_changes"])
+        self.assertEqual([r.source for r in results], ["rule", "llm"])
+
     def test_route_many_llm_disabled(self) -> None:
         original = config.ENABLE_LLM_FALLBACK
         config.ENABLE_LLM_FALLBACK = False
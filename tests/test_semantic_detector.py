@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+
+from git_nl import config
+from git_nl.definitions.router import IntentRouter
+from git_nl.definitions.semantic import SemanticIntentDetector
+
+
+class SemanticThresholdTests(unittest.TestCase):
+    def setUp(self) -> None:
+        # reset_hard needs 0.80 and commit_changes 0.70; the query scores ~0.77 and ~0.71.
+        self.detector = SemanticIntentDetector(
+            catalog={
+                "reset_hard": ["wipe stale files right now"],
+                "commit_changes": ["wipe stale files and commit them"],
+            }
+        )
+
+    def test_lenient_intent_that_clears_its_threshold_wins(self) -> None:
+        result = self.detector.detect("wipe stale files")
+        self.assertIsNotNone(result)
+        self.assertEqual(result.intent, "commit_changes")
+
+    def test_top_match_is_reported_when_nothing_clears(self) -> None:
+        match = self.detector.score("wipe stale")
+        self.assertIsNotNone(match)
+        self.assertEqual(match.intent, "reset_hard")
+        self.assertIsNone(self.detector.detect("wipe stale"))
+
+    def test_thresholds_are_read_at_match_time(self) -> None:
+        self.assertEqual(self.detector.score("wipe stale files").intent, "commit_changes")
+        # Same (memoized) query after a runtime config change: reset_hard now clears its bar.
+        with mock.patch.dict(config.SEMANTIC_CONFIDENCE_BY_INTENT, {"reset_hard": 0.75}):
+            self.assertEqual(self.detector.score("wipe stale files").intent, "reset_hard")
+            self.assertEqual(self.detector.detect("wipe stale files").intent, "reset_hard")
+
+
+class SemanticToleranceTests(unittest.TestCase):
+    # Scores 0.7999999999999999 against reset_soft's exact 0.80 threshold.
+    TEXT = "commit --onto soft reset new last caf\u00e9"
+
+    def setUp(self) -> None:
+        self.detector = SemanticIntentDetector()
+
+    def test_score_at_threshold_up_to_rounding_passes(self) -> None:
+        self.assertEqual(self.detector.score(self.TEXT).score, 0.7999999999999999)
+        result = self.detector.detect(self.TEXT)
+        self.assertIsNotNone(result)
+        self.assertEqual(result.intent, "reset_soft")
+
+    def test_router_accepts_score_at_threshold_up_to_rounding(self) -> None:
+        router = IntentRouter(semantic_detector=self.detector)
+        # The rule layer claims this text; skip it so the semantic check decides.
+        with mock.patch.object(router.rule_detector, "detect", return_value=None):
+            result = router.route(self.TEXT)
+        self.assertEqual(result.source, "semantic")
+        self.assertEqual(result.intent, "reset_soft")
+
+    def test_examples_must_be_unit_length(self) -> None:
+        with mock.patch("git_nl.definitions.semantic._l2_normalize", side_effect=lambda v: v):
+            with self.assertRaises(AssertionError):
+                SemanticIntentDetector(catalog={"reset_hard": ["reset reset"]})
+
+
+if __name__ == "__main__":
+    unittest.main()